@@ -1,20 +1,88 @@
-from fastapi import FastAPI, HTTPException
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
+from pathlib import Path
+from fastapi import FastAPI, Header, HTTPException, Request, Response
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
 from typing import Any, Literal, Optional
+import asyncio
+import hashlib
 import logging
-
-from optimizer.byog_engine import CalculationClass
-from optimizer.byog_optimizer import OptimizerService
+import multiprocessing
+import os
+import re
+import tempfile
+import threading
+import uuid
+
+import orjson
+import pyarrow as pa
+
+from optimizer.byog_engine import run_simulation
+from optimizer.byog_optimizer import run_optimization_job
 from optimizer.solver import run_optimization
+from optimizer.warmup import warm_up, warm_up_simulation
 
-logging.basicConfig(level=logging.INFO)
+logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO").upper())
 logger = logging.getLogger(__name__)
 
+
+def _log_event(event: str, **fields: Any) -> None:
+    """Log *event* at INFO as ``key=value`` pairs, also attached as ``extra``.
+
+    Nothing is formatted when INFO is disabled (e.g. ``LOG_LEVEL=WARNING``).
+    """
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(
+            "%s %s",
+            event,
+            " ".join(f"{key}={value}" for key, value in fields.items()),
+            extra={"event": event, **fields},
+        )
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson; NumPy arrays serialize natively."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start this worker's solver pools, warmed, and shut them down on exit."""
+    solver_pool = ProcessPoolExecutor(
+        max_workers=SOLVER_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=warm_up_simulation,
+    )
+    milp_pool = ThreadPoolExecutor(max_workers=SOLVER_WORKERS, thread_name_prefix="milp")
+    app.state.solver_pool = solver_pool
+    app.state.milp_pool = milp_pool
+
+    loop = asyncio.get_running_loop()
+    try:
+        await asyncio.to_thread(_init_dispatch_store)
+        # Spawn every process worker up front; a warm-up failure fails startup.
+        await asyncio.gather(
+            loop.run_in_executor(milp_pool, warm_up, COST_SCENARIOS["base"]),
+            *(loop.run_in_executor(solver_pool, os.getpid) for _ in range(SOLVER_WORKERS)),
+        )
+        yield
+    finally:
+        solver_pool.shutdown(wait=False, cancel_futures=True)
+        milp_pool.shutdown(wait=False, cancel_futures=True)
+
+
 app = FastAPI(
     title="PowerCouple Optimization API",
     description="MILP-based hybrid solar+storage optimization for gas plant co-location",
     version="0.1.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -43,6 +111,13 @@ class OptimizeRequest(BaseModel):
     gas_capacity_factor: Optional[float] = Field(default=None, ge=0.0, le=1.0)
     solar_cf_hint: Optional[float] = Field(default=None, ge=0.0)
     max_solar_mw: Optional[float] = Field(default=None, ge=0.0)
+    solver: Literal["highs", "cbc"] = "highs"
+    include_dispatch: bool = True
+
+
+# Built once at import and reused by the /optimize handler, which validates
+# the raw body itself instead of going through FastAPI's body dependency.
+_OPTIMIZE_REQUEST_ADAPTER = TypeAdapter(OptimizeRequest)
 
 
 class DispatchHourResponse(BaseModel):
@@ -76,6 +151,7 @@ class OptimizeResponse(BaseModel):
     solver_status: str
     lcoe_breakdown: Optional[LcoeBreakdownResponse] = None
     hourly_dispatch: Optional[list[DispatchHourResponse]] = None
+    job_id: Optional[str] = None
 
 
 class RequestMeta(BaseModel):
@@ -133,6 +209,7 @@ class DecisionVariableRange(BaseModel):
     max: float
     step: float = Field(gt=0)
     path: Optional[str] = None
+    tolerance: Optional[float] = Field(default=None, gt=0)
 
 
 class SingleVariableGoalSeek(BaseModel):
@@ -143,11 +220,13 @@ class SingleVariableGoalSeek(BaseModel):
 
 
 class MultiVariableOptimization(BaseModel):
-    mode: Literal["multi_variable"]
+    mode: Literal["multi_variable", "multi_variable_zoom"]
     target_variable: str
     goal: Literal["maximize", "minimize"] = "maximize"
     constraints: list[OptimizationConstraint] = Field(default_factory=list)
     decision_variables: dict[str, DecisionVariableRange]
+    zoom_levels: Optional[int] = Field(default=None, ge=1)
+    refine_factor: Optional[int] = Field(default=None, ge=1)
 
 
 class SensitivityAxis(BaseModel):
@@ -237,19 +316,190 @@ COST_SCENARIOS = {
 }
 
 
+# Public view of the scenarios served by /cost-scenarios.  The scenarios are
+# static, so the response body and its ETag are computed once at import.
+COST_SCENARIOS_CACHE_CONTROL = "public, max-age=86400, immutable"
+
+_COST_SCENARIOS_JSON = orjson.dumps({
+    name: {
+        "description": params["description"],
+        "solar_capex_per_kw": params["solar_capex_per_kw"],
+        "battery_energy_capex_per_kwh": params["battery_energy_capex_per_kwh"],
+        "battery_power_capex_per_kw": params["battery_power_capex_per_kw"],
+        "solar_om_per_kw_year": params["solar_om_per_kw_year"],
+        "battery_om_per_kw_year": params["battery_om_per_kw_year"],
+        "inverter_efficiency": params["inverter_efficiency"],
+        "battery_rte": params["battery_rte"],
+        "wacc": params["wacc"],
+        "gas_price_per_mmbtu": params["gas_price_per_mmbtu"],
+    }
+    for name, params in COST_SCENARIOS.items()
+})
+_COST_SCENARIOS_ETAG = f'"{hashlib.blake2b(_COST_SCENARIOS_JSON).hexdigest()[:16]}"'
+
+
+# ---------------------------------------------------------------------------
+# Solver worker pool
+# ---------------------------------------------------------------------------
+
+# Pure-Python BYOG simulations/optimizations run in a long-lived process pool
+# (app.state.solver_pool).  Each worker runs warm_up() once on start, so jobs
+# never pay import or solver start-up cost.
+#
+# MILP solves run on a thread pool instead (app.state.milp_pool): HiGHS is
+# driven in-process through highspy, which releases the GIL while solving, and
+# staying in-process avoids pickling the hourly dispatch back across a process
+# boundary.
+#
+# Both pools are created by lifespan(), once per uvicorn worker, so the cores
+# are split between the WEB_CONCURRENCY web workers rather than each of them
+# starting a full cpu-count pool.
+WEB_CONCURRENCY = max(1, int(os.environ.get("WEB_CONCURRENCY", 1)))
+SOLVER_WORKERS = int(
+    os.environ.get("SOLVER_WORKERS", max(1, (os.cpu_count() or 1) // WEB_CONCURRENCY))
+)
+
+
+async def _run_in_pool(pool, fn, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(pool, partial(fn, *args, **kwargs))
+
+
+# ---------------------------------------------------------------------------
+# Dispatch store
+# ---------------------------------------------------------------------------
+
+# Hourly dispatch of recent /optimize runs, keyed by job_id, so clients can
+# fetch it lazily (JSON or Arrow) instead of parsing it out of the summary.
+# Stored column-wise (one list per field), as returned with dispatch_format="soa".
+#
+# Each run is an orjson file in DISPATCH_STORE_DIR rather than an in-process
+# dict: every uvicorn worker on the host shares the directory, so a follow-up
+# request can land on any worker.  Multi-host deployments must point it at a
+# shared volume.  The newest DISPATCH_STORE_SIZE runs are kept: each worker
+# tracks how many files the store held after its last write or eviction and
+# only rescans the directory once that count passes the limit.
+#
+# All of this is blocking file I/O, so it runs off the event loop: writes on
+# the MILP pool right after the solve, reads in Starlette's threadpool.
+DISPATCH_STORE_SIZE = 64
+DISPATCH_STORE_DIR = Path(
+    os.environ.get("DISPATCH_STORE_DIR", Path(tempfile.gettempdir()) / "powercouple-dispatch")
+)
+DISPATCH_FIELDS = ("solar_mw", "battery_mw", "gas_mw", "load_mw", "soc")
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+_JOB_ID_RE = re.compile(r"[0-9a-f]{32}")
+
+_dispatch_store_lock = threading.Lock()
+_dispatch_store_count = 0
+
+
+def _evict_dispatch() -> int:
+    """Delete all but the newest DISPATCH_STORE_SIZE runs; return how many remain."""
+    stored = []
+    for path in DISPATCH_STORE_DIR.glob("*.json"):
+        try:
+            stored.append((path.stat().st_mtime_ns, path))
+        except FileNotFoundError:  # evicted concurrently by another worker
+            continue
+    stored.sort()
+    for _, path in stored[:-DISPATCH_STORE_SIZE]:
+        path.unlink(missing_ok=True)
+    return min(len(stored), DISPATCH_STORE_SIZE)
+
+
+def _init_dispatch_store() -> None:
+    """Create the store directory and trim runs left over from earlier processes."""
+    global _dispatch_store_count
+    DISPATCH_STORE_DIR.mkdir(parents=True, exist_ok=True)
+    with _dispatch_store_lock:
+        _dispatch_store_count = _evict_dispatch()
+
+
+def _store_dispatch(hourly_dispatch: dict[str, list]) -> str:
+    global _dispatch_store_count
+    job_id = uuid.uuid4().hex
+    # Write then rename, so readers in other workers never see a partial file.
+    tmp = DISPATCH_STORE_DIR / f".{job_id}.tmp"
+    tmp.write_bytes(orjson.dumps(hourly_dispatch))
+    os.replace(tmp, DISPATCH_STORE_DIR / f"{job_id}.json")
+
+    with _dispatch_store_lock:
+        _dispatch_store_count += 1
+        if _dispatch_store_count > DISPATCH_STORE_SIZE:
+            _dispatch_store_count = _evict_dispatch()
+    return job_id
+
+
+def _optimize_and_store(**kwargs: Any) -> dict:
+    """Run :func:`run_optimization` and persist its dispatch (runs on the MILP pool).
+
+    The private solver ``_basis`` is dropped and the new ``job_id`` added.
+    """
+    result = run_optimization(**kwargs)
+    result.pop("_basis", None)
+    result["job_id"] = _store_dispatch(result["hourly_dispatch"])
+    return result
+
+
+def _get_dispatch(job_id: str) -> dict[str, list]:
+    try:
+        if not _JOB_ID_RE.fullmatch(job_id):
+            raise FileNotFoundError(job_id)
+        return orjson.loads((DISPATCH_STORE_DIR / f"{job_id}.json").read_bytes())
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired job_id '{job_id}'")
+
+
+def _dispatch_rows(hourly_dispatch: dict[str, list]) -> list[dict]:
+    """Turn column-wise hourly dispatch into one dict per hour."""
+    return [dict(zip(hourly_dispatch, row)) for row in zip(*hourly_dispatch.values())]
+
+
+def _dispatch_to_arrow(hourly_dispatch: dict[str, list]) -> bytes:
+    """Serialize hourly dispatch as a columnar Arrow IPC stream (float32 columns)."""
+    arrays = [pa.array(hourly_dispatch["hour"], type=pa.int16())]
+    arrays.extend(pa.array(hourly_dispatch[field], type=pa.float32()) for field in DISPATCH_FIELDS)
+    batch = pa.RecordBatch.from_arrays(arrays, names=["hour", *DISPATCH_FIELDS])
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+    return sink.getvalue().to_pybytes()
+
+
 # ---------------------------------------------------------------------------
 # Endpoints
 # ---------------------------------------------------------------------------
 
-@app.post("/optimize", response_model=OptimizeResponse)
-async def optimize(request: OptimizeRequest):
+@app.post(
+    "/optimize",
+    response_model=OptimizeResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": _OPTIMIZE_REQUEST_ADAPTER.json_schema()}},
+        }
+    },
+)
+async def optimize(http_request: Request):
     """Run the MILP optimization for a hybrid solar+storage configuration."""
-    logger.info(
-        "Optimization request: plant_id=%s target_load=%.1f MW gas_backup_max=%.1f%% scenario=%s",
-        request.plant_id,
-        request.target_load_mw,
-        request.max_gas_backup_pct * 100,
-        request.cost_scenario,
+    body = await http_request.body()
+    try:
+        request = _OPTIMIZE_REQUEST_ADAPTER.validate_json(body)
+    except ValidationError as exc:
+        raise RequestValidationError(
+            [{**err, "loc": ("body", *err["loc"])} for err in exc.errors(include_url=False)],
+            body=body,
+        )
+
+    _log_event(
+        "optimize_request",
+        plant_id=request.plant_id,
+        target_load_mw=request.target_load_mw,
+        max_gas_backup_pct=request.max_gas_backup_pct,
+        cost_scenario=request.cost_scenario,
     )
 
     if request.cost_scenario not in COST_SCENARIOS:
@@ -274,7 +524,9 @@ async def optimize(request: OptimizeRequest):
     cost_params = COST_SCENARIOS[request.cost_scenario]
 
     try:
-        result = run_optimization(
+        result = await _run_in_pool(
+            app.state.milp_pool,
+            _optimize_and_store,
             plant_id=request.plant_id,
             target_load_mw=request.target_load_mw,
             max_gas_backup_pct=request.max_gas_backup_pct,
@@ -287,6 +539,8 @@ async def optimize(request: OptimizeRequest):
             gas_capacity_factor=request.gas_capacity_factor,
             solar_cf_hint=request.solar_cf_hint,
             max_solar_mw=request.max_solar_mw,
+            solver=request.solver,
+            dispatch_format="soa",
         )
     except ValueError as exc:
         logger.error("Validation error during optimization: %s", exc)
@@ -298,18 +552,37 @@ async def optimize(request: OptimizeRequest):
             detail=f"Optimization failed: {exc}",
         )
 
-    logger.info(
-        "Optimization complete: solar=%.1f MW  battery=%.1f MW/%.1f MWh  LCOE=%.2f $/MWh  status=%s",
-        result["solar_capacity_mw"],
-        result["battery_power_mw"],
-        result["battery_energy_mwh"],
-        result["net_lcoe"],
-        result["solver_status"],
+    _log_event(
+        "optimize_complete",
+        solar_capacity_mw=result["solar_capacity_mw"],
+        battery_power_mw=result["battery_power_mw"],
+        battery_energy_mwh=result["battery_energy_mwh"],
+        net_lcoe=result["net_lcoe"],
+        solver_status=result["solver_status"],
+    )
+
+    result["hourly_dispatch"] = (
+        _dispatch_rows(result["hourly_dispatch"]) if request.include_dispatch else None
     )
 
     return OptimizeResponse(**result)
 
 
+@app.get("/optimize/{job_id}/dispatch", response_model=list[DispatchHourResponse])
+def get_dispatch(job_id: str):
+    """Return the hourly dispatch of a previous /optimize run as JSON."""
+    return _dispatch_rows(_get_dispatch(job_id))
+
+
+@app.get("/optimize/{job_id}/dispatch.arrow")
+def get_dispatch_arrow(job_id: str):
+    """Return the hourly dispatch of a previous /optimize run as an Arrow IPC stream."""
+    return Response(
+        content=_dispatch_to_arrow(_get_dispatch(job_id)),
+        media_type=ARROW_STREAM_MEDIA_TYPE,
+    )
+
+
 @app.get("/health")
 async def health():
     """Health check endpoint."""
@@ -317,30 +590,25 @@ async def health():
 
 
 @app.get("/cost-scenarios")
-async def get_cost_scenarios():
-    """Return available cost scenarios with their parameters."""
-    return {
-        name: {
-            "description": params["description"],
-            "solar_capex_per_kw": params["solar_capex_per_kw"],
-            "battery_energy_capex_per_kwh": params["battery_energy_capex_per_kwh"],
-            "battery_power_capex_per_kw": params["battery_power_capex_per_kw"],
-            "solar_om_per_kw_year": params["solar_om_per_kw_year"],
-            "battery_om_per_kw_year": params["battery_om_per_kw_year"],
-            "inverter_efficiency": params["inverter_efficiency"],
-            "battery_rte": params["battery_rte"],
-            "wacc": params["wacc"],
-            "gas_price_per_mmbtu": params["gas_price_per_mmbtu"],
-        }
-        for name, params in COST_SCENARIOS.items()
-    }
+async def get_cost_scenarios(if_none_match: Optional[str] = Header(default=None)):
+    """Return available cost scenarios with their parameters.
+
+    The body is serialized once at import; clients that send the current
+    ETag back in ``If-None-Match`` get an empty 304.
+    """
+    headers = {"ETag": _COST_SCENARIOS_ETAG, "Cache-Control": COST_SCENARIOS_CACHE_CONTROL}
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if "*" in tags or _COST_SCENARIOS_ETAG in tags:
+            return Response(status_code=304, headers=headers)
+    return Response(content=_COST_SCENARIOS_JSON, media_type="application/json", headers=headers)
 
 
 @app.post("/simulate")
 async def simulate(request: BYOGScenarioRequest):
     payload = request.model_dump(exclude_none=True)
     try:
-        return CalculationClass(payload).run()
+        return await _run_in_pool(app.state.solver_pool, run_simulation, payload)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc))
     except Exception as exc:
@@ -352,25 +620,28 @@ async def simulate(request: BYOGScenarioRequest):
 async def optimize_byog(request: BYOGOptimizeRequest):
     payload = request.model_dump(exclude_none=True)
     try:
-        service = OptimizerService(payload)
-        job = payload["optimization_job"]
-        mode = job.get("mode")
-
-        if mode == "single_variable_goal_seek":
-            return service.single_variable_goal_seek(job)
-        if mode == "multi_variable":
-            return service.multi_variable_optimize(job)
-        if mode == "sensitivity_heatmap":
-            return service.dynamic_sensitivity_heatmap(job)
-
-        raise HTTPException(
-            status_code=400,
-            detail="optimization_job.mode must be one of: single_variable_goal_seek, multi_variable, sensitivity_heatmap",
-        )
+        return await _run_in_pool(app.state.solver_pool, run_optimization_job, payload)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc))
-    except HTTPException:
-        raise
     except Exception as exc:
         logger.exception("BYOG optimization failed")
         raise HTTPException(status_code=500, detail=f"Optimization failed: {exc}")
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    # Production launch: uvloop event loop + httptools parser, one worker per
+    # core by default.  Equivalent to
+    #   uvicorn main:app --loop uvloop --http httptools --workers $WEB_CONCURRENCY
+    # WEB_CONCURRENCY is exported so each worker sizes its solver pools to its
+    # share of the cores.
+    os.environ.setdefault("WEB_CONCURRENCY", str(os.cpu_count() or 1))
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=int(os.environ.get("PORT", 8000)),
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.environ["WEB_CONCURRENCY"]),
+    )
@@ -9,13 +9,26 @@ Implements:
 
 from __future__ import annotations
 
-from typing import Any
+import math
+from collections.abc import Callable, Mapping
+from dataclasses import MISSING, dataclass, fields
+from functools import lru_cache
+from types import MappingProxyType, UnionType
+from typing import Any, Union, get_args, get_origin, get_type_hints
 
 import numpy as np
 
+from optimizer.jit import njit
+
 HOURS_PER_YEAR = 8760
 EPSILON = 1e-9
 
+# Row layout of the per-year output buffer filled by ``_cashflow_kernel``.
+CF_OCCUPANCY, CF_GROSS_REVENUE, CF_POWER_COSTS, CF_CURTAILMENT, CF_OPEX, CF_EBITDA, CF_CUMULATIVE = range(7)
+CF_ROWS = 7
+# Row layout of the escalation-factor matrix from ``_escalation_factors``.
+ESC_CONTRACT, ESC_INFLATION, ESC_FUEL, ESC_ESA, ESC_OPEX = range(5)
+
 
 DEFAULT_BYOC_INPUTS: dict[str, Any] = {
     "site_land": {
@@ -144,6 +157,687 @@ DEFAULT_BYOC_INPUTS: dict[str, Any] = {
 }
 
 
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+# Read-only view of the defaults. Model inputs share its untouched sections
+# instead of copying the whole tree for every CalculationClass.
+_DEFAULT_FROZEN: Mapping[str, Any] = _freeze(DEFAULT_BYOC_INPUTS)
+
+
+def _apply_overrides(overrides: dict[str, Any]) -> dict[str, Any]:
+    """Overlay ``overrides`` on the defaults, copying only the sections they touch."""
+    model = dict(_DEFAULT_FROZEN)
+    pending = [(model, overrides)]
+    while pending:
+        target, override = pending.pop()
+        for key, value in override.items():
+            current = target.get(key)
+            if isinstance(value, dict) and isinstance(current, Mapping):
+                merged = dict(current)
+                target[key] = merged
+                pending.append((merged, value))
+            else:
+                target[key] = value
+    return model
+
+
+def _writable(model: dict[str, Any], *path: str) -> dict[str, Any]:
+    """Return the section at ``path``, replacing shared read-only nodes with copies."""
+    node = model
+    for key in path:
+        child = node[key]
+        if isinstance(child, MappingProxyType):
+            child = dict(child)
+            node[key] = child
+        node = child
+    return node
+
+
+def _escalation_factors(rates: list[float], period_years: int) -> np.ndarray:
+    """Return ``(1 + rate) ** year`` for each rate and year 0..N-1.
+
+    Built as running products (one multiply per year) and shared by every
+    ``_cashflow_kernel`` call in a run, since only the lease rate varies.
+    """
+    factors = np.empty((len(rates), max(period_years, 0)))
+    if period_years > 0:
+        factors[:, 0] = 1.0
+        factors[:, 1:] = 1.0 + np.asarray(rates, dtype=np.float64)[:, None]
+        np.cumprod(factors, axis=1, out=factors)
+    return factors
+
+
+@njit(cache=True)
+def _cashflow_kernel(
+    period_years,
+    total_project_cost,
+    stabilized_occ,
+    absorption,
+    leasable_mw,
+    base_rate,
+    solar_mw,
+    solar_om_rate,
+    battery_mw,
+    battery_om_rate,
+    gas_mw,
+    gas_fixed_om,
+    gas_gen,
+    gas_heat_rate,
+    fuel_cost,
+    gas_var_om,
+    esa_capacity,
+    esa_rate,
+    esa_demand_rate,
+    annual_revenue_lost,
+    base_ops,
+    property_tax,
+    insurance_rate,
+    asset_fee_rate,
+    other_ga,
+    escalation,
+    out,
+):
+    """Fill ``out`` (shape ``(CF_ROWS, period_years)``) with the yearly cash flow.
+
+    ``escalation`` is the matrix from ``_escalation_factors``. Returns
+    ``(payback_years, positive_years)``; payback is -1.0 when the project
+    never recovers its cost within the analysis period.
+    """
+    inv_stabilized_occ = 1.0 / max(stabilized_occ, 1e-9)
+    esa_demand = esa_capacity * esa_demand_rate * 12.0
+
+    cumulative = -total_project_cost
+    payback = -1.0
+    positive_years = 0
+
+    for y in range(period_years):
+        if absorption <= 0:
+            occ = stabilized_occ
+        else:
+            occ = min((y + 1) / absorption, 1.0) * stabilized_occ
+        occ_ratio = occ * inv_stabilized_occ
+        occupied_mw = leasable_mw * occ
+        contract_factor = escalation[ESC_CONTRACT, y]
+        inflation_factor = escalation[ESC_INFLATION, y]
+        fuel_factor = escalation[ESC_FUEL, y]
+        esa_factor = escalation[ESC_ESA, y]
+        opex_factor = escalation[ESC_OPEX, y]
+
+        gross_revenue = occupied_mw * base_rate * contract_factor * 12.0
+
+        power_costs = (
+            solar_mw * solar_om_rate * 1000.0 * inflation_factor
+            + battery_mw * battery_om_rate * 1000.0 * inflation_factor
+            + gas_mw * gas_fixed_om * 1000.0 * inflation_factor
+            + gas_gen * (gas_heat_rate * fuel_cost * fuel_factor + gas_var_om)
+            + esa_capacity * occ_ratio * 8760.0 * 0.5 * esa_rate * esa_factor
+            + esa_demand
+        )
+        curtail_loss = annual_revenue_lost * occ_ratio
+        opex = (
+            base_ops * occupied_mw * opex_factor
+            + property_tax
+            + occupied_mw * insurance_rate * opex_factor
+            + gross_revenue * asset_fee_rate
+            + other_ga * inflation_factor
+        )
+        ebitda = gross_revenue - power_costs - curtail_loss - opex
+
+        prior = cumulative
+        cumulative += ebitda
+        if ebitda > 0:
+            positive_years += 1
+        if payback < 0 and cumulative >= 0:
+            step = max(cumulative - prior, 1e-9)
+            payback = y + max(0.0, min(1.0, -prior / step))
+
+        out[CF_OCCUPANCY, y] = occ
+        out[CF_GROSS_REVENUE, y] = gross_revenue
+        out[CF_POWER_COSTS, y] = power_costs
+        out[CF_CURTAILMENT, y] = curtail_loss
+        out[CF_OPEX, y] = opex
+        out[CF_EBITDA, y] = ebitda
+        out[CF_CUMULATIVE, y] = cumulative
+
+    return payback, positive_years
+
+
+@njit(cache=True)
+def _irr_newton(cfs, low=-0.99, high=3.0, guess=0.1, tol=1e-12, max_iter=50):
+    """Newton-Raphson IRR of ``cfs`` (period 0 first).
+
+    NPV and its derivative are accumulated in one pass with a running
+    discount factor. Returns NaN when the cash flows change sign more than
+    once (the IRR may not be unique), when the NPV has no sign change over
+    ``[low, high]``, or when the iteration diverges or leaves the bracket,
+    so the caller can fall back to bisection.
+    """
+    n = cfs.shape[0]
+
+    sign_changes = 0
+    prev = 0.0
+    for t in range(n):
+        if cfs[t] != 0.0:
+            if prev != 0.0 and (cfs[t] > 0) != (prev > 0):
+                sign_changes += 1
+            prev = cfs[t]
+    if sign_changes > 1:
+        return np.nan
+
+    npv_low = 0.0
+    npv_high = 0.0
+    disc_low = 1.0
+    disc_high = 1.0
+    for t in range(n):
+        npv_low += cfs[t] * disc_low
+        npv_high += cfs[t] * disc_high
+        disc_low /= 1.0 + low
+        disc_high /= 1.0 + high
+    if (npv_low > 0) == (npv_high > 0) and npv_low != 0 and npv_high != 0:
+        return np.nan
+
+    rate = guess
+    for _ in range(max_iter):
+        base = 1.0 + rate
+        disc = 1.0
+        npv = 0.0
+        dnpv = 0.0
+        for t in range(n):
+            npv += cfs[t] * disc
+            dnpv -= t * cfs[t] * disc / base
+            disc /= base
+        if dnpv == 0.0 or not np.isfinite(dnpv):
+            return np.nan
+        step = npv / dnpv
+        rate -= step
+        if not (low < rate < high):
+            return np.nan
+        if abs(step) <= tol * max(1.0, abs(rate)):
+            return rate
+    return np.nan
+
+
+_FIELD_CASTS = (float, int, bool, str)
+
+
+@lru_cache(maxsize=None)
+def _field_specs(cls: type) -> tuple[tuple[str, Any, Callable[[Any], Any]], ...]:
+    """Resolve ``(name, default, cast)`` for each field of a ``_Params`` class.
+
+    Annotations are evaluated with ``typing.get_type_hints``, so any spelling
+    of ``T`` or ``T | None`` (``Optional[T]``) maps to the cast ``T``; other
+    types raise instead of silently skipping the cast.
+    """
+    hints = get_type_hints(cls)
+    specs = []
+    for field in fields(cls):
+        hint = hints[field.name]
+        if get_origin(hint) in (Union, UnionType):
+            args = tuple(arg for arg in get_args(hint) if arg is not type(None))
+            hint = args[0] if len(args) == 1 else hint
+        if hint not in _FIELD_CASTS:
+            raise TypeError(f"{cls.__name__}.{field.name}: unsupported field type {hints[field.name]!r}")
+        specs.append((field.name, field.default, hint))
+    return tuple(specs)
+
+
+class _Params:
+    """Base for the typed, read-only views of model input sections."""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_section(cls, section: Mapping[str, Any]) -> Any:
+        values: dict[str, Any] = {}
+        for name, default, cast in _field_specs(cls):
+            if name not in section and default is not MISSING:
+                values[name] = default
+                continue
+            raw = section[name]
+            values[name] = raw if raw is None else cast(raw)
+        return cls(**values)
+
+
+@dataclass(frozen=True, slots=True)
+class _LandParams(_Params):
+    land_parcel_size_acres: float
+    land_cost_per_acre_usd: float
+
+
+@dataclass(frozen=True, slots=True)
+class _PreconParams(_Params):
+    permitting_regulatory_usd: float
+    environmental_studies_usd: float
+    geotech_engineering_usd: float
+    interconnection_studies_usd: float
+    legal_fees_usd: float
+    title_insurance_usd: float
+    development_mgmt_usd: float
+    site_preparation_usd: float
+    utility_coordination_usd: float
+    financing_fees_usd: float
+
+
+@dataclass(frozen=True, slots=True)
+class _PowerParams(_Params):
+    substation_capacity_mva: float
+    substation_cost_per_mva_usd: float
+    transmission_distance_miles: float
+    transmission_cost_per_mile_usd: float
+    network_upgrades_usd: float
+    distribution_infra_usd: float
+
+
+@dataclass(frozen=True, slots=True)
+class _DCParams(_Params):
+    total_it_capacity_mw: float
+    construction_cost_per_kw_usd: float
+    ffe_usd: float
+    owners_costs_usd: float
+
+
+@dataclass(frozen=True, slots=True)
+class _LoadParams(_Params):
+    peak_it_load_mw: float
+    load_factor: float
+
+
+@dataclass(frozen=True, slots=True)
+class _ESAParams(_Params):
+    max_capacity_mw: float
+    transmission_import_limit_mw: float
+    elcc: float
+    energy_rate_usd_per_mwh: float
+    demand_charge_usd_per_mw_month: float
+    available: bool = True
+
+
+@dataclass(frozen=True, slots=True)
+class _SolarParams(_Params):
+    land_requirement_acres_per_mw: float
+    elcc: float
+    capital_cost_per_kw_usd: float
+    fixed_om_per_kw_year_usd: float
+    max_deployable_mw: float | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class _BatteryParams(_Params):
+    elcc: float
+    duration_hours: float
+    power_cost_per_kw_usd: float
+    energy_cost_per_kwh_usd: float
+    fixed_om_per_kw_year_usd: float
+
+
+@dataclass(frozen=True, slots=True)
+class _GasParams(_Params):
+    elcc: float
+    capital_cost_per_kw_usd: float
+    fixed_om_per_kw_year_usd: float
+    heat_rate_mmbtu_per_mwh: float
+    fuel_cost_usd_per_mmbtu: float
+    variable_om_per_mwh_usd: float
+
+
+@dataclass(frozen=True, slots=True)
+class _RevParams(_Params):
+    leasable_it_capacity_mw: float
+    revenue_model_type: str
+    base_lease_rate_wholesale_usd_per_mw_month: float
+    base_lease_rate_colo_usd_per_kw_month: float
+    absorption_period_years: float
+    dynamic_lease_pricing_enabled: bool = True
+    max_lease_rate_usd_per_mw_month: float = 600_000.0
+
+
+@dataclass(frozen=True, slots=True)
+class _OpexParams(_Params):
+    base_facility_ops_usd_per_mw_year: float
+    insurance_usd_per_mw_year: float
+    other_ga_usd_per_year: float
+
+
+@dataclass(frozen=True, slots=True)
+class _AnalysisParams(_Params):
+    analysis_period_years: int
+
+
+@dataclass(frozen=True, slots=True)
+class _SiteCapex:
+    """Land, preconstruction, power infrastructure and data center capital costs."""
+
+    land_cost: float
+    total_precon: float
+    total_power_infra: float
+    powered_land_cost: float
+    total_dc_capex: float
+
+
+@dataclass(frozen=True, slots=True)
+class _ResourceMix:
+    """Deterministic BYOC portfolio sizing and its capital cost."""
+
+    gross_firm_req: float
+    annual_energy_demand: float
+    esa_capacity: float
+    esa_elcc: float
+    esa_annual_import: float
+    optimal_solar_mw: float
+    solar_elcc: float
+    solar_annual_generation: float
+    gas_capacity_mw: float
+    gas_elcc: float
+    gas_annual_generation: float
+    battery_power_mw: float
+    battery_energy_mwh: float
+    battery_elcc: float
+    battery_annual_discharge_mwh: float
+    total_firm_accredited: float
+    coverage_ratio: float
+    estimated_curtailment_mwh: float
+    solar_capex: float
+    wind_capex: float
+    battery_capex: float
+    gas_capex: float
+    total_byoc_capex: float
+
+
+# Sweeps (goal seek, grid search, heatmaps) mostly vary financial inputs, so
+# capital costs and resource sizing repeat across runs. Both are memoized on
+# the (frozen, hashable) section parameters they read.
+@lru_cache(maxsize=256)
+def _site_capex(
+    land: _LandParams,
+    pre: _PreconParams,
+    pwr: _PowerParams,
+    dc: _DCParams,
+    pre_contingency: float,
+    power_contingency: float,
+    dc_contingency: float,
+) -> _SiteCapex:
+    land_cost = land.land_parcel_size_acres * land.land_cost_per_acre_usd
+
+    pre_subtotal = (
+        pre.permitting_regulatory_usd
+        + pre.environmental_studies_usd
+        + pre.geotech_engineering_usd
+        + pre.interconnection_studies_usd
+        + pre.legal_fees_usd
+        + pre.title_insurance_usd
+        + pre.development_mgmt_usd
+        + pre.site_preparation_usd
+        + pre.utility_coordination_usd
+        + pre.financing_fees_usd
+    )
+    pre_cont = pre_subtotal * pre_contingency
+    total_precon = pre_subtotal + pre_cont
+
+    substation_cost = pwr.substation_capacity_mva * pwr.substation_cost_per_mva_usd
+    transmission_cost = pwr.transmission_distance_miles * pwr.transmission_cost_per_mile_usd
+    power_subtotal = substation_cost + transmission_cost + pwr.network_upgrades_usd + pwr.distribution_infra_usd
+    power_cont = power_subtotal * power_contingency
+    total_power_infra = power_subtotal + power_cont
+    powered_land_cost = land_cost + total_precon + total_power_infra
+
+    dc_construction = dc.total_it_capacity_mw * dc.construction_cost_per_kw_usd * 1000.0
+    dc_subtotal = dc_construction + dc.ffe_usd + dc.owners_costs_usd
+    dc_cont = dc_subtotal * dc_contingency
+    total_dc_capex = dc_subtotal + dc_cont
+
+    return _SiteCapex(land_cost, total_precon, total_power_infra, powered_land_cost, total_dc_capex)
+
+
+@lru_cache(maxsize=256)
+def _resource_mix(
+    load: _LoadParams,
+    land_acres: float,
+    esa: _ESAParams,
+    solar: _SolarParams,
+    battery: _BatteryParams,
+    gas: _GasParams,
+    firm_req: float,
+    reserve_margin: float,
+    solar_cf: float,
+    max_gas_backup: float,
+) -> _ResourceMix:
+    # Guarded divisors as reciprocals, so the sizing below only multiplies.
+    inv_solar_land = 1.0 / max(solar.land_requirement_acres_per_mw, EPSILON)
+    inv_solar_yield = 1.0 / max(solar_cf * HOURS_PER_YEAR, EPSILON)
+    inv_gas_elcc = 1.0 / max(gas.elcc, EPSILON)
+    inv_battery_elcc = 1.0 / max(battery.elcc, EPSILON)
+
+    peak_mw = load.peak_it_load_mw
+    load_factor = load.load_factor
+    gross_firm_req = peak_mw * firm_req * (1 + reserve_margin)
+    annual_energy_demand = peak_mw * load_factor * HOURS_PER_YEAR
+
+    esa_capacity = (
+        min(esa.max_capacity_mw, esa.transmission_import_limit_mw, gross_firm_req)
+        if esa.available
+        else 0.0
+    )
+    esa_elcc = esa_capacity * esa.elcc
+    remaining_firm = max(gross_firm_req - esa_elcc, 0.0)
+
+    max_solar_by_land = land_acres * inv_solar_land
+    max_solar_deployable = max(
+        max_solar_by_land if solar.max_deployable_mw is None else solar.max_deployable_mw, 0.0
+    )
+    solar_energy_target = annual_energy_demand * inv_solar_yield
+    optimal_solar_mw = min(max_solar_by_land, max_solar_deployable, solar_energy_target)
+    solar_elcc = optimal_solar_mw * solar.elcc
+    solar_annual_generation = optimal_solar_mw * solar_cf * HOURS_PER_YEAR
+    remaining_firm = max(remaining_firm - solar_elcc, 0.0)
+
+    max_gas_backup_pct = max(0.0, min(1.0, max_gas_backup))
+    max_gas_elcc_allowed = gross_firm_req * max_gas_backup_pct
+
+    gas_elcc = min(remaining_firm, max_gas_elcc_allowed)
+    gas_capacity_mw = max(gas_elcc * inv_gas_elcc, 0.0)
+
+    remaining_after_gas = max(remaining_firm - gas_elcc, 0.0)
+    battery_elcc = remaining_after_gas
+    battery_power_mw = battery_elcc * inv_battery_elcc
+    battery_energy_mwh = battery_power_mw * battery.duration_hours
+
+    esa_annual_import = esa_capacity * HOURS_PER_YEAR * 0.5
+    residual_after_solar_esa = max(annual_energy_demand - solar_annual_generation - esa_annual_import, 0.0)
+    gas_annual_generation = min(gas_capacity_mw * HOURS_PER_YEAR, residual_after_solar_esa)
+    battery_annual_discharge_mwh = max(annual_energy_demand - solar_annual_generation - esa_annual_import - gas_annual_generation, 0.0)
+
+    total_firm_accredited = esa_elcc + solar_elcc + battery_elcc + gas_elcc
+    coverage_ratio = total_firm_accredited / max(gross_firm_req, EPSILON)
+
+    estimated_curtailment_mwh = max(
+        annual_energy_demand
+        - solar_annual_generation
+        - esa_annual_import
+        - gas_annual_generation,
+        0.0,
+    ) * 0.05
+
+    # 3.3 BYOC capex
+    solar_capex = optimal_solar_mw * solar.capital_cost_per_kw_usd * 1000.0
+    wind_capex = 0.0
+    battery_capex = (
+        battery_power_mw * battery.power_cost_per_kw_usd
+        + battery_energy_mwh * battery.energy_cost_per_kwh_usd
+    ) * 1000.0
+    gas_capex = gas_capacity_mw * gas.capital_cost_per_kw_usd * 1000.0
+    total_byoc_capex = solar_capex + wind_capex + battery_capex + gas_capex
+
+    return _ResourceMix(
+        gross_firm_req=gross_firm_req,
+        annual_energy_demand=annual_energy_demand,
+        esa_capacity=esa_capacity,
+        esa_elcc=esa_elcc,
+        esa_annual_import=esa_annual_import,
+        optimal_solar_mw=optimal_solar_mw,
+        solar_elcc=solar_elcc,
+        solar_annual_generation=solar_annual_generation,
+        gas_capacity_mw=gas_capacity_mw,
+        gas_elcc=gas_elcc,
+        gas_annual_generation=gas_annual_generation,
+        battery_power_mw=battery_power_mw,
+        battery_energy_mwh=battery_energy_mwh,
+        battery_elcc=battery_elcc,
+        battery_annual_discharge_mwh=battery_annual_discharge_mwh,
+        total_firm_accredited=total_firm_accredited,
+        coverage_ratio=coverage_ratio,
+        estimated_curtailment_mwh=estimated_curtailment_mwh,
+        solar_capex=solar_capex,
+        wind_capex=wind_capex,
+        battery_capex=battery_capex,
+        gas_capex=gas_capex,
+        total_byoc_capex=total_byoc_capex,
+    )
+
+
+# Column layout of the per-scenario parameter matrix for ``_cashflow_batch``:
+# the ``_cashflow_kernel`` scalar arguments after ``period_years``, in order.
+BATCH_PARAMS = 24
+BATCH_PAYBACK, BATCH_POSITIVE_YEARS, BATCH_IRR = range(3)
+
+
+@njit(cache=True)
+def _cashflow_batch(period_years, params, escalation, out, kpis):
+    """Evaluate many scenarios' cash flows and Newton IRR in one JIT call.
+
+    Row ``i`` of ``params`` (see ``BATCH_PARAMS``), ``escalation[i]`` and
+    ``out[i]`` are one scenario's kernel inputs and buffer. ``kpis[i]`` gets
+    ``(payback, positive_years, irr)``; IRR is NaN where Newton declined and
+    the caller must fall back to bisection.
+    """
+    for i in range(params.shape[0]):
+        p = params[i]
+        payback, positive_years = _cashflow_kernel(
+            period_years,
+            p[0], p[1], p[2], p[3], p[4], p[5], p[6], p[7], p[8], p[9], p[10], p[11],
+            p[12], p[13], p[14], p[15], p[16], p[17], p[18], p[19], p[20], p[21], p[22], p[23],
+            escalation[i],
+            out[i],
+        )
+        series = np.empty(period_years + 1)
+        series[0] = -p[0]
+        series[1:] = out[i, CF_EBITDA]
+        kpis[i, BATCH_PAYBACK] = payback
+        kpis[i, BATCH_POSITIVE_YEARS] = positive_years
+        kpis[i, BATCH_IRR] = _irr_newton(series, -0.99, 3.0, 0.1, 1e-12, 50)
+
+
+@dataclass(slots=True)
+class CashflowTable:
+    """Yearly cash flow projection stored column-wise.
+
+    Columns are views into the ``_cashflow_kernel`` output buffer; row dicts
+    are only produced by :meth:`to_records` for the JSON response.
+    """
+
+    year: np.ndarray
+    occupancy: np.ndarray
+    gross_revenue: np.ndarray
+    power_costs: np.ndarray
+    curtailment_loss: np.ndarray
+    opex: np.ndarray
+    ebitda: np.ndarray
+    cumulative: np.ndarray
+    depreciation: float
+
+    @classmethod
+    def from_buffer(cls, yearly: np.ndarray, depreciation: float) -> CashflowTable:
+        return cls(
+            year=np.arange(1, yearly.shape[1] + 1),
+            occupancy=yearly[CF_OCCUPANCY],
+            gross_revenue=yearly[CF_GROSS_REVENUE],
+            power_costs=yearly[CF_POWER_COSTS],
+            curtailment_loss=yearly[CF_CURTAILMENT],
+            opex=yearly[CF_OPEX],
+            ebitda=yearly[CF_EBITDA],
+            cumulative=yearly[CF_CUMULATIVE],
+            depreciation=depreciation,
+        )
+
+    def __len__(self) -> int:
+        return len(self.year)
+
+    def to_records(self) -> list[dict[str, Any]]:
+        """Per-year waterfall rows in the ``cash_flow_waterfall`` response format."""
+        depreciation = round(self.depreciation, 2)
+        return [
+            {
+                "year": year,
+                "occupancy_rate": round(o, 6),
+                "gross_revenue_usd": round(gr, 2),
+                "total_power_costs_usd": round(pc, 2),
+                "curtailment_loss_usd": round(cl, 2),
+                "total_opex_usd": round(ox, 2),
+                "ebitda_usd": round(e, 2),
+                "depreciation_usd": depreciation,
+                "ebit_usd": round(e - self.depreciation, 2),
+                "net_free_cash_flow_usd": round(e, 2),
+                "cumulative_cash_flow_usd": round(cu, 2),
+            }
+            for year, o, gr, pc, cl, ox, e, cu in zip(
+                self.year.tolist(),
+                self.occupancy.tolist(),
+                self.gross_revenue.tolist(),
+                self.power_costs.tolist(),
+                self.curtailment_loss.tolist(),
+                self.opex.tolist(),
+                self.ebitda.tolist(),
+                self.cumulative.tolist(),
+            )
+        ]
+
+
+@dataclass(slots=True)
+class _Rates:
+    """Percentage inputs of one run, normalized to fractions."""
+
+    discount: float
+    inflation: float
+    contract_esc: float
+    opex_esc: float
+    fuel_esc: float
+    esa_esc: float
+    stabilized_occ: float
+    property_tax: float
+    asset_fee: float
+    solar_cf: float
+    firm_req: float
+    reserve_margin: float
+    max_gas_backup: float
+    hurdle_irr: float
+    target_buffer: float
+    pre_contingency: float
+    power_contingency: float
+    dc_contingency: float
+
+
+@dataclass(slots=True)
+class _RunInputs:
+    """Everything ``run()`` needs before the lease-rate calibration starts."""
+
+    rates: _Rates
+    capex: _SiteCapex
+    mix: _ResourceMix
+    weighted_curtail_cost: float
+    annual_revenue_lost: float
+    total_project_cost: float
+    base_lease_rate: float
+    depreciation: float
+    period_years: int
+    lead_args: tuple
+    cost_args: tuple
+
+
 class CalculationClass:
     """Financial transfer function used by simulate/optimize workflows."""
 
@@ -154,59 +848,120 @@ class CalculationClass:
         self.fin = payload.get("financial_assumptions", {})
         self.model = self._build_model_inputs()
         self._validate_guardrails()
+        self._tier_arr = self._curtailment_tier_arrays()
+        self._build_params()
+        self._inputs: _RunInputs | None = None
+        # Lease rate -> (yearly, series, payback, positive_years, irr); may be
+        # pre-filled by ``run_many`` with batched base-rate results.
+        self._evaluated: dict[float, tuple[np.ndarray, np.ndarray, float | None, int, float | None]] = {}
+
+    def _normalized_rates(self) -> _Rates:
+        """Collect every percentage input and normalize them in one NumPy pass."""
+        m = self.model
+        rev, opx, ana = m["revenue"], m["opex"], m["analysis"]
+        rc = m["resource_costs"]
+        raw = np.array(
+            [
+                ana["discount_rate_pct"],
+                ana["general_inflation_rate_pct"],
+                rev["contract_escalation_rate_pct"],
+                opx["opex_escalation_rate_pct"],
+                rc["natural_gas"]["fuel_price_escalation_pct"],
+                rc["esa_grid"]["energy_escalation_pct"],
+                rev["stabilized_occupancy_pct"],
+                opx["property_tax_rate_pct"],
+                opx["asset_mgmt_fee_pct"],
+                rc["solar"]["capacity_factor_pct"],
+                m["firmness"]["base_firm_generation_requirement_pct"],
+                m["firmness"]["planning_reserve_margin_pct"],
+                ana.get("max_gas_backup_pct", 1.0),
+                ana.get("required_equity_return_pct", 12.0),
+                rev.get("target_irr_buffer_pct", 1.0),
+                m["preconstruction"]["contingency_pct"],
+                m["power_infrastructure"]["contingency_pct"],
+                m["data_center"]["contingency_pct"],
+            ],
+            dtype=np.float64,
+        )
+        # Values >= 1 are percentages; smaller values are already fractions.
+        return _Rates(*np.where(raw >= 1.0, raw / 100.0, raw).tolist())
 
-    def _normalize_pct(self, value: float | None) -> float:
-        if value is None:
-            return 0.0
-        if value >= 1.0:
-            return value / 100.0
-        return value
+    def _build_params(self) -> None:
+        """Typed, slotted views of the model sections read by ``run()``."""
+        m = self.model
+        rc = m["resource_costs"]
+        self.land = _LandParams.from_section(m["site_land"])
+        self.precon = _PreconParams.from_section(m["preconstruction"])
+        self.power = _PowerParams.from_section(m["power_infrastructure"])
+        self.dc = _DCParams.from_section(m["data_center"])
+        self.load = _LoadParams.from_section(m["load_profile"])
+        self.esa = _ESAParams.from_section(rc["esa_grid"])
+        self.solar = _SolarParams.from_section(rc["solar"])
+        self.battery = _BatteryParams.from_section(rc["battery"])
+        self.gas = _GasParams.from_section(rc["natural_gas"])
+        self.rev = _RevParams.from_section(m["revenue"])
+        self.opex = _OpexParams.from_section(m["opex"])
+        self.analysis = _AnalysisParams.from_section(m["analysis"])
+
+    def _compute_capex(self, rates: _Rates) -> _SiteCapex:
+        """3.1 Capital costs (memoized across runs)."""
+        return _site_capex(
+            self.land,
+            self.precon,
+            self.power,
+            self.dc,
+            rates.pre_contingency,
+            rates.power_contingency,
+            rates.dc_contingency,
+        )
 
-    def _deep_merge(self, base: dict[str, Any], override: dict[str, Any]) -> dict[str, Any]:
-        merged = dict(base)
-        for key, value in override.items():
-            if isinstance(value, dict) and isinstance(merged.get(key), dict):
-                merged[key] = self._deep_merge(merged[key], value)
-            else:
-                merged[key] = value
-        return merged
+    def _size_resources(self, rates: _Rates) -> _ResourceMix:
+        """3.2 Portfolio sizing and 3.3 BYOC capex (memoized across runs)."""
+        return _resource_mix(
+            self.load,
+            self.land.land_parcel_size_acres,
+            self.esa,
+            self.solar,
+            self.battery,
+            self.gas,
+            rates.firm_req,
+            rates.reserve_margin,
+            rates.solar_cf,
+            rates.max_gas_backup,
+        )
 
     def _build_model_inputs(self) -> dict[str, Any]:
         overrides = self.payload.get("byoc_inputs", {})
-        model = self._deep_merge(DEFAULT_BYOC_INPUTS, overrides)
+        model = _apply_overrides(overrides)
 
         # Compatibility bridge from existing payload fields.
         if self.site:
             peak_mw = float(self.site.get("facility_peak_load_kw", 0.0)) / 1000.0
             if peak_mw > 0:
-                model["load_profile"]["peak_it_load_mw"] = peak_mw
-                model["data_center"]["total_it_capacity_mw"] = max(
-                    model["data_center"].get("total_it_capacity_mw", peak_mw),
+                _writable(model, "load_profile")["peak_it_load_mw"] = peak_mw
+                data_center = _writable(model, "data_center")
+                data_center["total_it_capacity_mw"] = max(
+                    data_center.get("total_it_capacity_mw", peak_mw),
                     peak_mw,
                 )
 
         if self.asset:
             gen_mw = float(self.asset.get("nameplate_capacity_kw", 0.0)) / 1000.0
+            gas = _writable(model, "resource_costs", "natural_gas")
             if gen_mw > 0:
-                model["resource_costs"]["natural_gas"].setdefault("seed_nameplate_mw", gen_mw)
+                gas.setdefault("seed_nameplate_mw", gen_mw)
             if self.asset.get("fuel_price_usd_per_mmbtu") is not None:
-                model["resource_costs"]["natural_gas"]["fuel_cost_usd_per_mmbtu"] = float(
-                    self.asset["fuel_price_usd_per_mmbtu"]
-                )
+                gas["fuel_cost_usd_per_mmbtu"] = float(self.asset["fuel_price_usd_per_mmbtu"])
             if self.asset.get("fuel_escalator_pct") is not None:
-                model["resource_costs"]["natural_gas"]["fuel_price_escalation_pct"] = float(
-                    self.asset["fuel_escalator_pct"]
-                )
+                gas["fuel_price_escalation_pct"] = float(self.asset["fuel_escalator_pct"])
             if self.asset.get("heat_rate_btu_kwh") is not None:
-                model["resource_costs"]["natural_gas"]["heat_rate_mmbtu_per_mwh"] = float(
-                    self.asset["heat_rate_btu_kwh"]
-                ) / 1000.0
+                gas["heat_rate_mmbtu_per_mwh"] = float(self.asset["heat_rate_btu_kwh"]) / 1000.0
 
         if self.fin:
             if self.fin.get("discount_rate_pct") is not None:
-                model["analysis"]["discount_rate_pct"] = float(self.fin["discount_rate_pct"])
+                _writable(model, "analysis")["discount_rate_pct"] = float(self.fin["discount_rate_pct"])
             if self.fin.get("inflation_rate_pct") is not None:
-                model["analysis"]["general_inflation_rate_pct"] = float(self.fin["inflation_rate_pct"])
+                _writable(model, "analysis")["general_inflation_rate_pct"] = float(self.fin["inflation_rate_pct"])
 
         peak_mw = float(model["load_profile"]["peak_it_load_mw"])
         tiers = model["curtailment"]["tiers"]
@@ -215,7 +970,10 @@ class CalculationClass:
             tier1 = next((t for t in tiers if t.get("name") == "tier1"), None)
             if tier1 is not None:
                 other_total = sum(float(t.get("mw", 0.0)) for t in tiers if t is not tier1)
-                tier1["mw"] = max(peak_mw - other_total, 0.0)
+                tier1_mw = max(peak_mw - other_total, 0.0)
+                _writable(model, "curtailment")["tiers"] = [
+                    {**t, "mw": tier1_mw} if t is tier1 else t for t in tiers
+                ]
 
         return model
 
@@ -253,15 +1011,37 @@ class CalculationClass:
             return 1.0 / years
         return (rate * (1 + rate) ** years) / ((1 + rate) ** years - 1)
 
+    @classmethod
+    def _irr(cls, cashflows: list[float] | np.ndarray, guess: float = 0.1) -> float | None:
+        """IRR via the JIT Newton solver, falling back to bisection.
+
+        ``guess`` seeds Newton; passing a nearby known root (e.g. the IRR at
+        an adjacent lease rate) cuts the iteration count.
+        """
+        cfs = np.asarray(cashflows, dtype=np.float64)
+        rate = _irr_newton(cfs, guess=guess)
+        if math.isfinite(rate):
+            return float(rate)
+        return cls._irr_bisection(cfs.tolist())
+
     @staticmethod
     def _irr_bisection(cashflows: list[float], low: float = -0.99, high: float = 3.0, iterations: int = 200) -> float | None:
         def npv(rate: float) -> float:
-            return sum(cf / ((1 + rate) ** t) for t, cf in enumerate(cashflows))
+            # Running discount product instead of a pow per term.
+            growth = 1 + rate
+            disc = 1.0
+            total = 0.0
+            for cf in cashflows:
+                total += cf * disc
+                disc /= growth
+            return float(total)
 
         low_npv = npv(low)
         high_npv = npv(high)
 
-        if np.sign(low_npv) == np.sign(high_npv):
+        # Plain float comparisons; sign 0 (an exact root) is kept distinct.
+        low_sign = (low_npv > 0) - (low_npv < 0)
+        if low_sign == (high_npv > 0) - (high_npv < 0):
             return None
 
         for _ in range(iterations):
@@ -269,334 +1049,311 @@ class CalculationClass:
             mid_npv = npv(mid)
             if abs(mid_npv) <= 1e-7:
                 return mid
-            if np.sign(mid_npv) == np.sign(low_npv):
+            if (mid_npv > 0) - (mid_npv < 0) == low_sign:
                 low = mid
-                low_npv = mid_npv
             else:
                 high = mid
         return (low + high) / 2
 
-    def _weighted_curtailment_cost(self, total_mwh: float, tiers: list[dict[str, Any]]) -> float:
+    def _curtailment_tier_arrays(self) -> dict[str, np.ndarray]:
+        """Curtailable tiers (tier1 excluded) as parallel arrays sorted by revenue loss."""
+        tiers = [t for t in self.model["curtailment"]["tiers"] if t.get("name") != "tier1"]
+        mw = np.array([float(t.get("mw", 0.0)) for t in tiers])
+        hours = np.array([float(t.get("max_event_hours", 0.0)) for t in tiers])
+        events = np.array([float(t.get("max_events", 0.0)) for t in tiers])
+        loss = np.array([float(t.get("revenue_loss_per_mwh", 0.0)) for t in tiers])
+        order = np.argsort(loss, kind="stable")
+        cap = (mw * hours * events)[order]
+        return {"mw": mw[order], "cap": cap, "cum_cap": np.cumsum(cap), "loss": loss[order]}
+
+    def _weighted_curtailment_cost(self, total_mwh: float) -> float:
         if total_mwh <= 0:
             return 0.0
-        ordered = sorted(
-            [t for t in tiers if t.get("name") != "tier1"],
-            key=lambda t: float(t.get("revenue_loss_per_mwh", 0.0)),
-        )
-        remaining = total_mwh
-        total_cost = 0.0
-        for tier in ordered:
-            tier_cap = float(tier.get("mw", 0.0)) * float(tier.get("max_event_hours", 0.0)) * float(tier.get("max_events", 0.0))
-            consumed = min(remaining, tier_cap)
-            total_cost += consumed * float(tier.get("revenue_loss_per_mwh", 0.0))
-            remaining -= consumed
-            if remaining <= 0:
-                break
-        if remaining > 0 and ordered:
-            total_cost += remaining * float(ordered[-1].get("revenue_loss_per_mwh", 0.0))
+        tiers = self._tier_arr
+        cap, cum_cap, loss = tiers["cap"], tiers["cum_cap"], tiers["loss"]
+        if loss.size == 0:
+            return 0.0
+        # Fill the cheapest tiers first; anything beyond the last tier's
+        # capacity is charged at the most expensive tier's loss rate.
+        idx = int(np.searchsorted(cum_cap, total_mwh))
+        if idx >= loss.size:
+            total_cost = float(loss @ cap) + (total_mwh - float(cum_cap[-1])) * float(loss[-1])
+        else:
+            filled = float(cum_cap[idx - 1]) if idx else 0.0
+            total_cost = float(loss[:idx] @ cap[:idx]) + (total_mwh - filled) * float(loss[idx])
         return total_cost / total_mwh
 
-    def run(self) -> dict[str, Any]:
-        m = self.model
-        land = m["site_land"]
-        pre = m["preconstruction"]
-        pwr = m["power_infrastructure"]
-        dc = m["data_center"]
-        load = m["load_profile"]
-        curtail = m["curtailment"]
-        firm = m["firmness"]
-        rc = m["resource_costs"]
-        rev = m["revenue"]
-        opx = m["opex"]
-        ana = m["analysis"]
-
-        discount = self._normalize_pct(float(ana["discount_rate_pct"]))
-        inflation = self._normalize_pct(float(ana["general_inflation_rate_pct"]))
-        period_years = int(ana["analysis_period_years"])
-
-        # 3.1 Capital costs
-        land_cost = float(land["land_parcel_size_acres"]) * float(land["land_cost_per_acre_usd"])
-
-        pre_items = [
-            "permitting_regulatory_usd",
-            "environmental_studies_usd",
-            "geotech_engineering_usd",
-            "interconnection_studies_usd",
-            "legal_fees_usd",
-            "title_insurance_usd",
-            "development_mgmt_usd",
-            "site_preparation_usd",
-            "utility_coordination_usd",
-            "financing_fees_usd",
-        ]
-        pre_subtotal = sum(float(pre[k]) for k in pre_items)
-        pre_cont = pre_subtotal * self._normalize_pct(float(pre["contingency_pct"]))
-        total_precon = pre_subtotal + pre_cont
-
-        substation_cost = float(pwr["substation_capacity_mva"]) * float(pwr["substation_cost_per_mva_usd"])
-        transmission_cost = float(pwr["transmission_distance_miles"]) * float(pwr["transmission_cost_per_mile_usd"])
-        power_subtotal = (
-            substation_cost
-            + transmission_cost
-            + float(pwr["network_upgrades_usd"])
-            + float(pwr["distribution_infra_usd"])
-        )
-        power_cont = power_subtotal * self._normalize_pct(float(pwr["contingency_pct"]))
-        total_power_infra = power_subtotal + power_cont
-        powered_land_cost = land_cost + total_precon + total_power_infra
-
-        dc_construction = float(dc["total_it_capacity_mw"]) * float(dc["construction_cost_per_kw_usd"]) * 1000.0
-        dc_subtotal = dc_construction + float(dc["ffe_usd"]) + float(dc["owners_costs_usd"])
-        dc_cont = dc_subtotal * self._normalize_pct(float(dc["contingency_pct"]))
-        total_dc_capex = dc_subtotal + dc_cont
-
-        # 3.2 Optimization engine
-        peak_mw = float(load["peak_it_load_mw"])
-        load_factor = float(load["load_factor"])
-        gross_firm_req = peak_mw * self._normalize_pct(float(firm["base_firm_generation_requirement_pct"])) * (
-            1 + self._normalize_pct(float(firm["planning_reserve_margin_pct"]))
-        )
-        annual_energy_demand = peak_mw * load_factor * HOURS_PER_YEAR
-
-        esa = rc["esa_grid"]
-        solar = rc["solar"]
-        battery = rc["battery"]
-        gas = rc["natural_gas"]
-
-        esa_available = bool(esa.get("available", True))
-        esa_capacity = (
-            min(float(esa["max_capacity_mw"]), float(esa["transmission_import_limit_mw"]), gross_firm_req)
-            if esa_available
-            else 0.0
-        )
-        esa_elcc = esa_capacity * float(esa["elcc"])
-        remaining_firm = max(gross_firm_req - esa_elcc, 0.0)
-
-        solar_cf = self._normalize_pct(float(solar["capacity_factor_pct"]))
-        max_solar_by_land = float(land["land_parcel_size_acres"]) / max(float(solar["land_requirement_acres_per_mw"]), EPSILON)
-        max_solar_deployable = max(float(solar.get("max_deployable_mw", max_solar_by_land)), 0.0)
-        solar_energy_target = annual_energy_demand / max(solar_cf * HOURS_PER_YEAR, EPSILON)
-        optimal_solar_mw = min(max_solar_by_land, max_solar_deployable, solar_energy_target)
-        solar_elcc = optimal_solar_mw * float(solar["elcc"])
-        solar_annual_generation = optimal_solar_mw * solar_cf * HOURS_PER_YEAR
-        remaining_firm = max(remaining_firm - solar_elcc, 0.0)
-
-        max_gas_backup_pct = max(
-            0.0,
-            min(1.0, self._normalize_pct(float(ana.get("max_gas_backup_pct", 1.0)))),
-        )
-        max_gas_elcc_allowed = gross_firm_req * max_gas_backup_pct
-
-        gas_elcc = min(remaining_firm, max_gas_elcc_allowed)
-        gas_capacity_mw = max(gas_elcc / max(float(gas["elcc"]), EPSILON), 0.0)
-
-        remaining_after_gas = max(remaining_firm - gas_elcc, 0.0)
-        battery_elcc = remaining_after_gas
-        battery_power_mw = battery_elcc / max(float(battery["elcc"]), EPSILON)
-        battery_energy_mwh = battery_power_mw * float(battery["duration_hours"])
-
-        remaining_firm = max(remaining_after_gas - battery_elcc, 0.0)
-        esa_annual_import = esa_capacity * HOURS_PER_YEAR * 0.5
-        residual_after_solar_esa = max(annual_energy_demand - solar_annual_generation - esa_annual_import, 0.0)
-        gas_annual_generation = min(gas_capacity_mw * HOURS_PER_YEAR, residual_after_solar_esa)
-        battery_annual_discharge_mwh = max(annual_energy_demand - solar_annual_generation - esa_annual_import - gas_annual_generation, 0.0)
-
-        total_firm_accredited = esa_elcc + solar_elcc + battery_elcc + gas_elcc
-        coverage_ratio = total_firm_accredited / max(gross_firm_req, EPSILON)
-
-        estimated_curtailment_mwh = max(
-            annual_energy_demand
-            - solar_annual_generation
-            - esa_annual_import
-            - gas_annual_generation,
-            0.0,
-        ) * 0.05
-
-        weighted_curtail_cost = self._weighted_curtailment_cost(float(estimated_curtailment_mwh), list(curtail["tiers"]))
-        annual_revenue_lost = estimated_curtailment_mwh * weighted_curtail_cost
-
-        # 3.3 BYOC capex
-        solar_capex = optimal_solar_mw * float(solar["capital_cost_per_kw_usd"]) * 1000.0
-        wind_capex = 0.0
-        battery_capex = (
-            battery_power_mw * float(battery["power_cost_per_kw_usd"])
-            + battery_energy_mwh * float(battery["energy_cost_per_kwh_usd"])
-        ) * 1000.0
-        gas_capex = gas_capacity_mw * float(gas["capital_cost_per_kw_usd"]) * 1000.0
-        total_byoc_capex = solar_capex + wind_capex + battery_capex + gas_capex
-
-        total_project_cost = powered_land_cost + total_dc_capex + total_byoc_capex
+    def _prepare(self) -> _RunInputs:
+        """Capex, sizing and the fixed cash flow kernel inputs (computed once)."""
+        if self._inputs is not None:
+            return self._inputs
+
+        esa, solar, battery, gas = self.esa, self.solar, self.battery, self.gas
+        rev, opx = self.rev, self.opex
+
+        rates = self._normalized_rates()
+        period_years = self.analysis.analysis_period_years
+
+        capex = self._compute_capex(rates)
+        mix = self._size_resources(rates)
+
+        weighted_curtail_cost = self._weighted_curtailment_cost(float(mix.estimated_curtailment_mwh))
+        annual_revenue_lost = mix.estimated_curtailment_mwh * weighted_curtail_cost
+
+        total_project_cost = capex.powered_land_cost + capex.total_dc_capex + mix.total_byoc_capex
 
         # 5 Cash Flow
-        stabilized_occ = self._normalize_pct(float(rev["stabilized_occupancy_pct"]))
-        absorption = float(rev["absorption_period_years"])
-        contract_esc = self._normalize_pct(float(rev["contract_escalation_rate_pct"]))
-        opex_esc = self._normalize_pct(float(opx["opex_escalation_rate_pct"]))
-        fuel_esc = self._normalize_pct(float(gas["fuel_price_escalation_pct"]))
-        esa_esc = self._normalize_pct(float(esa["energy_escalation_pct"]))
-
-        lease_type = str(rev["revenue_model_type"]).lower()
+        stabilized_occ = rates.stabilized_occ
+        absorption = rev.absorption_period_years
+
+        lease_type = rev.revenue_model_type.lower()
         if lease_type == "colo":
-            base_lease_rate = float(rev["base_lease_rate_colo_usd_per_kw_month"]) * 1000.0
+            base_lease_rate = rev.base_lease_rate_colo_usd_per_kw_month * 1000.0
         else:
-            base_lease_rate = float(rev["base_lease_rate_wholesale_usd_per_mw_month"])
-
-        def build_cashflows(base_rate_per_mw_month: float) -> tuple[list[dict[str, Any]], list[float], float | None, int]:
-            rows: list[dict[str, Any]] = []
-            series = [-total_project_cost]
-            cumulative_local = -total_project_cost
-            payback_local: float | None = None
-            positive_years = 0
-
-            for year in range(1, period_years + 1):
-                occ = stabilized_occ if absorption <= 0 else min(year / absorption, 1.0) * stabilized_occ
-                occupied_mw = float(rev["leasable_it_capacity_mw"]) * occ
-                lease_rate_y = base_rate_per_mw_month * ((1 + contract_esc) ** (year - 1))
-                gross_revenue = occupied_mw * lease_rate_y * 12.0
-
-                inflation_y = (1 + inflation) ** (year - 1)
-                solar_om = optimal_solar_mw * float(solar["fixed_om_per_kw_year_usd"]) * 1000.0 * inflation_y
-                battery_om = battery_power_mw * float(battery["fixed_om_per_kw_year_usd"]) * 1000.0 * inflation_y
-
-                fuel_price_y = float(gas["fuel_cost_usd_per_mmbtu"]) * ((1 + fuel_esc) ** (year - 1))
-                gas_cost = (
-                    gas_capacity_mw * float(gas["fixed_om_per_kw_year_usd"]) * 1000.0 * inflation_y
-                    + gas_annual_generation
-                    * (
-                        float(gas["heat_rate_mmbtu_per_mwh"]) * fuel_price_y
-                        + float(gas["variable_om_per_mwh_usd"])
-                    )
-                )
+            base_lease_rate = rev.base_lease_rate_wholesale_usd_per_mw_month
 
-                esa_energy = (
-                    esa_capacity
-                    * (occ / max(stabilized_occ, EPSILON))
-                    * HOURS_PER_YEAR
-                    * 0.5
-                    * float(esa["energy_rate_usd_per_mwh"])
-                    * ((1 + esa_esc) ** (year - 1))
-                )
-                esa_demand = esa_capacity * float(esa["demand_charge_usd_per_mw_month"]) * 12.0
-                total_power_costs = solar_om + battery_om + gas_cost + esa_energy + esa_demand
+        depreciation = total_project_cost / max(period_years, 1)
+        # Rows follow ESC_CONTRACT, ESC_INFLATION, ESC_FUEL, ESC_ESA, ESC_OPEX.
+        escalation = _escalation_factors(
+            [rates.contract_esc, rates.inflation, rates.fuel_esc, rates.esa_esc, rates.opex_esc], period_years
+        )
 
-                curtail_loss = annual_revenue_lost * (occ / max(stabilized_occ, EPSILON))
+        # Everything except the lease rate is fixed for the run, so the
+        # kernel's other inputs are read from the model once, not per call.
+        lead_args = (
+            period_years,
+            total_project_cost,
+            stabilized_occ,
+            absorption,
+            rev.leasable_it_capacity_mw,
+        )
+        cost_args = (
+            mix.optimal_solar_mw,
+            solar.fixed_om_per_kw_year_usd,
+            mix.battery_power_mw,
+            battery.fixed_om_per_kw_year_usd,
+            mix.gas_capacity_mw,
+            gas.fixed_om_per_kw_year_usd,
+            mix.gas_annual_generation,
+            gas.heat_rate_mmbtu_per_mwh,
+            gas.fuel_cost_usd_per_mmbtu,
+            gas.variable_om_per_mwh_usd,
+            mix.esa_capacity,
+            esa.energy_rate_usd_per_mwh,
+            esa.demand_charge_usd_per_mw_month,
+            annual_revenue_lost,
+            opx.base_facility_ops_usd_per_mw_year,
+            total_project_cost * rates.property_tax,
+            opx.insurance_usd_per_mw_year,
+            rates.asset_fee,
+            opx.other_ga_usd_per_year,
+            escalation,
+        )
 
-                facility_ops = (
-                    float(opx["base_facility_ops_usd_per_mw_year"]) * occupied_mw * ((1 + opex_esc) ** (year - 1))
-                )
-                property_taxes = total_project_cost * self._normalize_pct(float(opx["property_tax_rate_pct"]))
-                insurance = occupied_mw * float(opx["insurance_usd_per_mw_year"]) * ((1 + opex_esc) ** (year - 1))
-                asset_fee = gross_revenue * self._normalize_pct(float(opx["asset_mgmt_fee_pct"]))
-                other_ga = float(opx["other_ga_usd_per_year"]) * inflation_y
-                total_opex = facility_ops + property_taxes + insurance + asset_fee + other_ga
-
-                ebitda = gross_revenue - total_power_costs - curtail_loss - total_opex
-                depreciation = total_project_cost / max(period_years, 1)
-                ebit = ebitda - depreciation
-
-                year_fcf = ebitda
-                if year_fcf > 0:
-                    positive_years += 1
-                prior = cumulative_local
-                cumulative_local += year_fcf
-                series.append(year_fcf)
-
-                if payback_local is None and cumulative_local >= 0:
-                    step = max(cumulative_local - prior, EPSILON)
-                    payback_local = (year - 1) + max(0.0, min(1.0, -prior / step))
-
-                rows.append(
-                    {
-                        "year": year,
-                        "occupancy_rate": round(occ, 6),
-                        "gross_revenue_usd": round(gross_revenue, 2),
-                        "total_power_costs_usd": round(total_power_costs, 2),
-                        "curtailment_loss_usd": round(curtail_loss, 2),
-                        "total_opex_usd": round(total_opex, 2),
-                        "ebitda_usd": round(ebitda, 2),
-                        "depreciation_usd": round(depreciation, 2),
-                        "ebit_usd": round(ebit, 2),
-                        "net_free_cash_flow_usd": round(year_fcf, 2),
-                        "cumulative_cash_flow_usd": round(cumulative_local, 2),
-                    }
+        self._inputs = _RunInputs(
+            rates=rates,
+            capex=capex,
+            mix=mix,
+            weighted_curtail_cost=weighted_curtail_cost,
+            annual_revenue_lost=annual_revenue_lost,
+            total_project_cost=total_project_cost,
+            base_lease_rate=base_lease_rate,
+            depreciation=depreciation,
+            period_years=period_years,
+            lead_args=lead_args,
+            cost_args=cost_args,
+        )
+        return self._inputs
+
+    @classmethod
+    def run_many(cls, payloads: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Run a batch of independent scenarios (e.g. a sensitivity sweep).
+
+        Every scenario's base-lease-rate cash flow and IRR are evaluated
+        together in one JIT call per analysis period (serially: the caller
+        already runs in one of several solver processes). Scenarios that need
+        lease-rate calibration continue from that result one by one.
+        """
+        calcs = [cls(payload) for payload in payloads]
+        by_period: dict[int, list[CalculationClass]] = {}
+        for calc in calcs:
+            by_period.setdefault(calc._prepare().period_years, []).append(calc)
+
+        for period_years, group in by_period.items():
+            inputs = [calc._prepare() for calc in group]
+            params = np.array(
+                [(*inp.lead_args[1:], inp.base_lease_rate, *inp.cost_args[:-1]) for inp in inputs],
+                dtype=np.float64,
+            ).reshape(len(group), BATCH_PARAMS)
+            escalation = np.stack([inp.cost_args[-1] for inp in inputs])
+            out = np.empty((len(group), CF_ROWS, period_years))
+            kpis = np.empty((len(group), 3))
+            _cashflow_batch(period_years, params, escalation, out, kpis)
+
+            for k, (calc, inp) in enumerate(zip(group, inputs)):
+                series = np.concatenate(([-inp.total_project_cost], out[k, CF_EBITDA]))
+                irr_k = float(kpis[k, BATCH_IRR])
+                irr = irr_k if math.isfinite(irr_k) else cls._irr_bisection(series.tolist())
+                payback = float(kpis[k, BATCH_PAYBACK])
+                calc._evaluated[inp.base_lease_rate] = (
+                    out[k],
+                    series,
+                    None if payback < 0 else payback,
+                    int(kpis[k, BATCH_POSITIVE_YEARS]),
+                    irr,
                 )
 
-            return rows, series, payback_local, positive_years
+        return [calc.run() for calc in calcs]
 
-        dynamic_lease_enabled = bool(rev.get("dynamic_lease_pricing_enabled", True))
-        hurdle_irr = self._normalize_pct(float(ana.get("required_equity_return_pct", 12.0)))
-        target_buffer = self._normalize_pct(float(rev.get("target_irr_buffer_pct", 1.0)))
+    def run(self) -> dict[str, Any]:
+        inputs = self._prepare()
+        rates, capex, mix = inputs.rates, inputs.capex, inputs.mix
+        weighted_curtail_cost = inputs.weighted_curtail_cost
+        annual_revenue_lost = inputs.annual_revenue_lost
+        total_project_cost = inputs.total_project_cost
+        base_lease_rate = inputs.base_lease_rate
+        depreciation = inputs.depreciation
+        period_years = inputs.period_years
+        lead_args, cost_args = inputs.lead_args, inputs.cost_args
+        rev = self.rev
+
+        # Bound once: both are called on every calibration step.
+        irr_of = self._irr
+        isfinite = math.isfinite
+
+        def build_cashflows(base_rate_per_mw_month: float) -> tuple[np.ndarray, np.ndarray, float | None, int]:
+            out = np.empty((CF_ROWS, period_years))
+            payback, positive_years = _cashflow_kernel(*lead_args, base_rate_per_mw_month, *cost_args, out)
+            payback_local = None if payback < 0 else float(payback)
+            # Unlevered FCF == EBITDA.
+            series = np.concatenate(([-total_project_cost], out[CF_EBITDA]))
+
+            return out, series, payback_local, int(positive_years)
+
+        dynamic_lease_enabled = rev.dynamic_lease_pricing_enabled
+        hurdle_irr = rates.hurdle_irr
+        target_buffer = rates.target_buffer
         target_irr = max(hurdle_irr + target_buffer, hurdle_irr)
 
-        cash_flow_rows, fcf, payback_year, positive_years = build_cashflows(base_lease_rate)
-        irr = self._irr_bisection(fcf)
+        # Calibration probes neighbouring lease rates, so each IRR solve is
+        # warm-started from the previous root and repeated rates are memoized.
+        evaluated = self._evaluated
+        prev_irr = 0.1
+
+        def evaluate(rate: float) -> tuple[np.ndarray, np.ndarray, float | None, int, float | None]:
+            nonlocal prev_irr
+            hit = evaluated.get(rate)
+            if hit is not None:
+                if hit[4] is not None and isfinite(hit[4]):
+                    prev_irr = hit[4]
+                return hit
+            yearly_e, series_e, payback_e, pos_e = build_cashflows(rate)
+            irr_e = irr_of(series_e, guess=prev_irr)
+            if irr_e is not None and isfinite(irr_e):
+                prev_irr = irr_e
+            evaluated[rate] = (yearly_e, series_e, payback_e, pos_e, irr_e)
+            return evaluated[rate]
+
+        yearly, fcf, payback_year, positive_years, irr = evaluate(base_lease_rate)
 
         applied_lease_rate = base_lease_rate
         calibration_applied = False
 
         if dynamic_lease_enabled:
-            irr_for_check = irr if irr is not None and np.isfinite(irr) else -0.99
+            irr_for_check = irr if irr is not None and isfinite(irr) else -0.99
             needs_lift = irr_for_check < target_irr or positive_years < max(1, int(period_years * 0.6))
             if needs_lift:
                 lo = base_lease_rate
                 hi = max(base_lease_rate * 1.25, base_lease_rate + 10_000.0)
-                max_lease = float(rev.get("max_lease_rate_usd_per_mw_month", 600_000.0))
+                max_lease = rev.max_lease_rate_usd_per_mw_month
 
-                best_rows = cash_flow_rows
+                best_yearly = yearly
                 best_series = fcf
                 best_payback = payback_year
                 best_irr = irr_for_check
                 best_positive_years = positive_years
                 best_rate = applied_lease_rate
 
+                min_positive = max(1, int(period_years * 0.6))
+                f_lo = irr_for_check - target_irr
+
                 while hi <= max_lease + EPSILON:
-                    rows_h, series_h, payback_h, pos_h = build_cashflows(hi)
-                    irr_h = self._irr_bisection(series_h)
-                    irr_h_val = irr_h if irr_h is not None and np.isfinite(irr_h) else -0.99
+                    yearly_h, series_h, payback_h, pos_h, irr_h = evaluate(hi)
+                    irr_h_val = irr_h if irr_h is not None and isfinite(irr_h) else -0.99
 
                     if irr_h_val > best_irr:
-                        best_rows, best_series, best_payback = rows_h, series_h, payback_h
+                        best_yearly, best_series, best_payback = yearly_h, series_h, payback_h
                         best_irr = irr_h_val
                         best_positive_years = pos_h
                         best_rate = hi
 
-                    if irr_h_val >= target_irr and pos_h >= max(1, int(period_years * 0.6)):
+                    if irr_h_val >= target_irr and pos_h >= min_positive:
                         break
+                    # A failing expansion step is a tighter lower bound than the
+                    # base rate, so the search below starts from the last one.
+                    lo, f_lo = hi, irr_h_val - target_irr
                     hi *= 1.25
 
                 if hi > max_lease:
                     hi = max_lease
 
-                for _ in range(40):
-                    mid = (lo + hi) / 2
-                    rows_m, series_m, payback_m, pos_m = build_cashflows(mid)
-                    irr_m = self._irr_bisection(series_m)
-                    irr_m_val = irr_m if irr_m is not None and np.isfinite(irr_m) else -0.99
-
-                    if irr_m_val >= target_irr and pos_m >= max(1, int(period_years * 0.6)):
-                        hi = mid
-                        best_rows, best_series, best_payback = rows_m, series_m, payback_m
-                        best_irr = irr_m_val
-                        best_positive_years = pos_m
-                        best_rate = mid
-                    else:
-                        lo = mid
+                # IRR rises smoothly with the lease rate, so the lowest rate that
+                # clears the target is found by Illinois false position on
+                # irr(rate) - target over [lo, hi]. Bisection steps are used when
+                # the secant is unusable (e.g. an endpoint fails only on
+                # positive years). The search is skipped outright when even
+                # ``hi`` misses the target.
+                _, _, _, pos_hi, irr_hi = evaluate(hi)
+                irr_hi_val = irr_hi if irr_hi is not None and isfinite(irr_hi) else -0.99
+                f_hi = irr_hi_val - target_irr
+                last_side = 0
+
+                if irr_hi_val >= target_irr and pos_hi >= min_positive:
+                    for _ in range(40):
+                        if hi - lo <= 1e-12 * hi or f_hi == 0.0:
+                            break
+                        mid = (lo + hi) / 2
+                        if f_lo < 0.0 <= f_hi:
+                            secant = hi - f_hi * (hi - lo) / (f_hi - f_lo)
+                            if lo < secant < hi:
+                                mid = secant
+
+                        yearly_m, series_m, payback_m, pos_m, irr_m = evaluate(mid)
+                        irr_m_val = irr_m if irr_m is not None and isfinite(irr_m) else -0.99
+
+                        if irr_m_val >= target_irr and pos_m >= min_positive:
+                            hi, f_hi = mid, irr_m_val - target_irr
+                            if last_side == 1:
+                                f_lo /= 2
+                            last_side = 1
+                            best_yearly, best_series, best_payback = yearly_m, series_m, payback_m
+                            best_irr = irr_m_val
+                            best_positive_years = pos_m
+                            best_rate = mid
+                        else:
+                            lo, f_lo = mid, irr_m_val - target_irr
+                            if last_side == -1:
+                                f_hi /= 2
+                            last_side = -1
 
                 if best_rate > applied_lease_rate + EPSILON:
                     applied_lease_rate = best_rate
-                    cash_flow_rows, fcf, payback_year = best_rows, best_series, best_payback
+                    yearly, fcf, payback_year = best_yearly, best_series, best_payback
                     irr = best_irr
                     positive_years = best_positive_years
                     calibration_applied = True
 
-        irr = self._irr_bisection(fcf) if not isinstance(irr, float) else irr
-        irr_pct = float(irr * 100.0) if irr is not None and np.isfinite(irr) else 0.0
-        npv = float(sum(cf / ((1 + discount) ** i) for i, cf in enumerate(fcf)))
-        moic = float(sum(fcf[1:]) / max(abs(fcf[0]), EPSILON))
+        # Per-year rows are only materialized for the chosen lease rate, and
+        # only as dicts when the response is assembled.
+        cash_flows = CashflowTable.from_buffer(yearly, depreciation)
+        irr_pct = float(irr * 100.0) if irr is not None and isfinite(irr) else 0.0
+        discount_factors = np.power(1.0 / (1.0 + rates.discount), np.arange(fcf.size))
+        npv = float(fcf @ discount_factors)
+        moic = float(fcf[1:].sum() / max(abs(fcf[0]), EPSILON))
 
-        annualized_capex = total_project_cost * self._crf(discount, max(period_years, 1))
-        year1_power = cash_flow_rows[0]["total_power_costs_usd"] if cash_flow_rows else 0.0
-        lcoe_mwh = (annualized_capex + year1_power) / max(annual_energy_demand, EPSILON)
+        annualized_capex = total_project_cost * self._crf(rates.discount, max(period_years, 1))
+        year1_power = round(float(cash_flows.power_costs[0]), 2) if len(cash_flows) else 0.0
+        lcoe_mwh = (annualized_capex + year1_power) / max(mix.annual_energy_demand, EPSILON)
 
         summary_kpis = {
             "project_irr_unlevered_pct": round(irr_pct, 3),
@@ -608,9 +1365,9 @@ class CalculationClass:
             "lcoe_usd_mwh": round(lcoe_mwh, 3),
             "lcoe_usd_kwh": round(lcoe_mwh / 1000.0, 6),
             "annual_revenue_lost_usd": round(annual_revenue_lost, 2),
-            "coverage_ratio": round(coverage_ratio, 6),
-            "firm_capacity_required_mw": round(gross_firm_req, 6),
-            "firm_capacity_available_mw": round(total_firm_accredited, 6),
+            "coverage_ratio": round(mix.coverage_ratio, 6),
+            "firm_capacity_required_mw": round(mix.gross_firm_req, 6),
+            "firm_capacity_available_mw": round(mix.total_firm_accredited, 6),
             "total_project_cost_usd": round(total_project_cost, 2),
             "min_dscr": 999.0,
             "base_lease_rate_usd_per_mw_month": round(base_lease_rate, 2),
@@ -626,38 +1383,38 @@ class CalculationClass:
                 "summary_kpis": summary_kpis,
                 "calculation_breakdown": {
                     "capital_costs": {
-                        "land_cost_usd": round(land_cost, 2),
-                        "total_preconstruction_usd": round(total_precon, 2),
-                        "total_power_infrastructure_usd": round(total_power_infra, 2),
-                        "powered_land_cost_usd": round(powered_land_cost, 2),
-                        "total_data_center_capex_usd": round(total_dc_capex, 2),
-                        "solar_capex_usd": round(solar_capex, 2),
-                        "wind_capex_usd": round(wind_capex, 2),
-                        "battery_capex_usd": round(battery_capex, 2),
-                        "gas_capex_usd": round(gas_capex, 2),
-                        "total_byoc_capex_usd": round(total_byoc_capex, 2),
+                        "land_cost_usd": round(capex.land_cost, 2),
+                        "total_preconstruction_usd": round(capex.total_precon, 2),
+                        "total_power_infrastructure_usd": round(capex.total_power_infra, 2),
+                        "powered_land_cost_usd": round(capex.powered_land_cost, 2),
+                        "total_data_center_capex_usd": round(capex.total_dc_capex, 2),
+                        "solar_capex_usd": round(mix.solar_capex, 2),
+                        "wind_capex_usd": round(mix.wind_capex, 2),
+                        "battery_capex_usd": round(mix.battery_capex, 2),
+                        "gas_capex_usd": round(mix.gas_capex, 2),
+                        "total_byoc_capex_usd": round(mix.total_byoc_capex, 2),
                         "total_project_cost_usd": round(total_project_cost, 2),
                     },
                     "resource_mix": {
-                        "solar_mw": round(optimal_solar_mw, 6),
-                        "solar_firm_accredited_mw": round(solar_elcc, 6),
-                        "annual_solar_generation_mwh": round(solar_annual_generation, 3),
-                        "battery_power_mw": round(battery_power_mw, 6),
-                        "battery_energy_mwh": round(battery_energy_mwh, 6),
-                        "battery_firm_accredited_mw": round(battery_elcc, 6),
-                        "annual_battery_discharge_mwh": round(battery_annual_discharge_mwh, 3),
-                        "gas_mw": round(gas_capacity_mw, 6),
-                        "gas_firm_accredited_mw": round(gas_elcc, 6),
-                        "annual_gas_generation_mwh": round(gas_annual_generation, 3),
-                        "esa_mw": round(esa_capacity, 6),
-                        "esa_firm_accredited_mw": round(esa_elcc, 6),
-                        "annual_esa_import_mwh": round(esa_annual_import, 3),
-                        "annual_energy_demand_mwh": round(annual_energy_demand, 3),
-                        "total_firm_accredited_mw": round(total_firm_accredited, 6),
-                        "coverage_ratio": round(coverage_ratio, 6),
+                        "solar_mw": round(mix.optimal_solar_mw, 6),
+                        "solar_firm_accredited_mw": round(mix.solar_elcc, 6),
+                        "annual_solar_generation_mwh": round(mix.solar_annual_generation, 3),
+                        "battery_power_mw": round(mix.battery_power_mw, 6),
+                        "battery_energy_mwh": round(mix.battery_energy_mwh, 6),
+                        "battery_firm_accredited_mw": round(mix.battery_elcc, 6),
+                        "annual_battery_discharge_mwh": round(mix.battery_annual_discharge_mwh, 3),
+                        "gas_mw": round(mix.gas_capacity_mw, 6),
+                        "gas_firm_accredited_mw": round(mix.gas_elcc, 6),
+                        "annual_gas_generation_mwh": round(mix.gas_annual_generation, 3),
+                        "esa_mw": round(mix.esa_capacity, 6),
+                        "esa_firm_accredited_mw": round(mix.esa_elcc, 6),
+                        "annual_esa_import_mwh": round(mix.esa_annual_import, 3),
+                        "annual_energy_demand_mwh": round(mix.annual_energy_demand, 3),
+                        "total_firm_accredited_mw": round(mix.total_firm_accredited, 6),
+                        "coverage_ratio": round(mix.coverage_ratio, 6),
                     },
                     "curtailment": {
-                        "estimated_annual_curtailment_mwh": round(estimated_curtailment_mwh, 2),
+                        "estimated_annual_curtailment_mwh": round(mix.estimated_curtailment_mwh, 2),
                         "weighted_average_curtailment_cost_usd_per_mwh": round(weighted_curtail_cost, 3),
                         "annual_revenue_lost_usd": round(annual_revenue_lost, 2),
                     },
@@ -670,6 +1427,11 @@ class CalculationClass:
                         "positive_cashflow_years": int(positive_years),
                     },
                 },
-                "cash_flow_waterfall": cash_flow_rows,
+                "cash_flow_waterfall": cash_flows.to_records(),
             }
         }
+
+
+def run_simulation(payload: dict[str, Any]) -> dict[str, Any]:
+    """Run a single simulation for *payload* (worker-pool entry point)."""
+    return CalculationClass(payload).run()
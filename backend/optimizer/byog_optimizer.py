@@ -8,27 +8,155 @@ Implements:
 
 from __future__ import annotations
 
-import copy
+import itertools
+import json
+import math
+import pickle
+from collections import OrderedDict
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any
 
+import numpy as np
+
 from optimizer.byog_engine import CalculationClass
+from optimizer.jit import njit
+
+# Grid leaves handed to the engine per batch in multi_variable_optimize.
+LEAF_BATCH_SIZE = 256
+
+# Summary KPIs of recent grid points, keyed by the base payload's fingerprint
+# plus the decision values patched into it, so re-visited points (overlapping
+# sweeps, heatmap scrubbing) skip ``CalculationClass.run()``.  Only the small
+# KPI dicts are kept, never full simulations with their yearly tables; the
+# winning point of a search is simulated again for the response.
+KPI_CACHE_SIZE = 1024
+
+_kpi_cache: OrderedDict[tuple, dict[str, Any]] = OrderedDict()
+
+
+def _cache_get(key: tuple) -> dict[str, Any] | None:
+    kpis = _kpi_cache.get(key)
+    if kpis is not None:
+        _kpi_cache.move_to_end(key)
+    return kpis
+
+
+def _cache_put(key: tuple, kpis: dict[str, Any]) -> None:
+    _kpi_cache[key] = kpis
+    while len(_kpi_cache) > KPI_CACHE_SIZE:
+        _kpi_cache.popitem(last=False)
+
+
+# Constraint operator codes understood by ``_scan_leaves``.
+OP_LESS_THAN, OP_LESS_THAN_EQUAL, OP_GREATER_THAN, OP_GREATER_THAN_EQUAL, OP_EQUAL = range(5)
+CONSTRAINT_OPS = {
+    "less_than": OP_LESS_THAN,
+    "less_than_equal": OP_LESS_THAN_EQUAL,
+    "greater_than": OP_GREATER_THAN,
+    "greater_than_equal": OP_GREATER_THAN_EQUAL,
+    "equal": OP_EQUAL,
+}
+
+
+@njit(cache=True)
+def _scan_leaves(values, ops, targets, objective, goal, incumbent):
+    """Constraint-check and reduce one batch of grid leaves, in order.
+
+    Parameters
+    ----------
+    values : ndarray, shape (n, k)
+        KPI value for each leaf and constraint (NaN when missing, which fails).
+    ops, targets : ndarray, shape (k,)
+        Operator code and target value of each constraint.
+    objective : ndarray, shape (n,)
+        Target KPI of each leaf (NaN when missing; such leaves never win).
+    goal : int
+        1 to maximize, -1 to minimize, 0 to keep the first candidate.
+    incumbent : float
+        Best objective so far, or NaN when there is none.
+
+    Returns
+    -------
+    tuple
+        ``(feasible_count, best_index, best_value)``; ``best_index`` is -1
+        when no leaf in the batch improves on ``incumbent``.
+    """
+    feasible = 0
+    best = -1
+    for i in range(values.shape[0]):
+        ok = True
+        for j in range(ops.shape[0]):
+            v = values[i, j]
+            target = targets[j]
+            op = ops[j]
+            if op == OP_LESS_THAN:
+                ok = v < target
+            elif op == OP_LESS_THAN_EQUAL:
+                ok = v <= target
+            elif op == OP_GREATER_THAN:
+                ok = v > target
+            elif op == OP_GREATER_THAN_EQUAL:
+                ok = v >= target
+            else:
+                ok = abs(v - target) <= 1e-6
+            if not ok:
+                break
+        if not ok:
+            continue
+        feasible += 1
+
+        metric = objective[i]
+        if math.isnan(metric):
+            continue
+        if math.isnan(incumbent) or (goal > 0 and metric > incumbent) or (goal < 0 and metric < incumbent):
+            incumbent = metric
+            best = i
+    return feasible, best, incumbent
+
+
+def _clone(obj: Any) -> Any:
+    """Deep-copy plain payload data via a pickle round trip (faster than deepcopy)."""
+    return pickle.loads(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+@lru_cache(maxsize=256)
+def _split_path(path: str) -> tuple[str, ...]:
+    """Split a dotted payload path once; sweeps reuse the same few paths."""
+    return tuple(path.split("."))
+
+
+def _grid_values(spec: dict[str, Any]) -> list[float]:
+    """Return ``min, min + step, ...`` up to ``max`` (inclusive), rounded to 6 places."""
+    start = float(spec["min"])
+    stop = float(spec["max"])
+    step = float(spec["step"])
+    if step <= 0:
+        raise ValueError("Grid step must be positive")
+    n = max(int(math.floor((stop - start) / step + 1e-9)) + 1, 0)
+    return np.round(start + np.arange(n) * step, 6).tolist()
 
 
 @dataclass
 class Candidate:
     objective_value: float
     payload: dict[str, Any]
-    simulation: dict[str, Any]
+    assignments: tuple[tuple[str, float], ...] = ()
 
 
 class OptimizerService:
     def __init__(self, base_payload: dict[str, Any]) -> None:
         self.base_payload = base_payload
+        # The job spec is not a simulation input, so it stays out of the key.
+        self._fingerprint = json.dumps(
+            {k: v for k, v in base_payload.items() if k != "optimization_job"},
+            sort_keys=True,
+            default=str,
+        )
 
     @staticmethod
     def _set_nested(payload: dict[str, Any], path: str, value: float) -> None:
-        keys = path.split(".")
+        keys = _split_path(path)
         current = payload
         for key in keys[:-1]:
             if key not in current or not isinstance(current[key], dict):
@@ -37,38 +165,100 @@ class OptimizerService:
         current[keys[-1]] = value
 
     @staticmethod
-    def _get_kpi(simulation: dict[str, Any], metric: str) -> float | None:
-        return simulation.get("simulation_results", {}).get("summary_kpis", {}).get(metric)
+    def _with_values(payload: dict[str, Any], assignments: tuple[tuple[str, float], ...]) -> dict[str, Any]:
+        """Return a copy of *payload* with each ``(path, value)`` assignment applied.
+
+        Only the dicts along the assigned paths are copied; every other section
+        is shared with *payload*, which is left untouched.
+        """
+        out = dict(payload)
+        for path, value in assignments:
+            keys = _split_path(path)
+            current = out
+            for key in keys[:-1]:
+                child = current.get(key)
+                child = dict(child) if isinstance(child, dict) else {}
+                current[key] = child
+                current = child
+            current[keys[-1]] = value
+        return out
+
+    @staticmethod
+    def _summary_kpis(simulation: dict[str, Any]) -> dict[str, Any]:
+        return simulation.get("simulation_results", {}).get("summary_kpis", {})
+
+    @classmethod
+    def _get_kpi(cls, simulation: dict[str, Any], metric: str) -> float | None:
+        return cls._summary_kpis(simulation).get(metric)
 
     @staticmethod
-    def _constraint_passes(simulation: dict[str, Any], constraint: dict[str, Any]) -> bool:
-        metric = constraint["metric"]
-        op = constraint["operator"]
-        target = float(constraint["value"])
-        value = simulation.get("simulation_results", {}).get("summary_kpis", {}).get(metric)
-        if value is None:
-            return False
-
-        if op == "less_than":
-            return value < target
-        if op == "less_than_equal":
-            return value <= target
-        if op == "greater_than":
-            return value > target
-        if op == "greater_than_equal":
-            return value >= target
-        if op == "equal":
-            return abs(value - target) <= 1e-6
-        raise ValueError(f"Unsupported constraint operator '{op}'")
+    def _monotone_signs(spec: dict[str, Any]) -> dict[str, int]:
+        """Parse a decision variable's ``monotone`` map into ``{metric: +1 | -1}``."""
+        signs: dict[str, int] = {}
+        for metric, direction in spec.get("monotone", {}).items():
+            if direction not in ("increasing", "decreasing"):
+                raise ValueError(
+                    f"monotone direction for '{metric}' must be 'increasing' or 'decreasing'"
+                )
+            signs[metric] = 1 if direction == "increasing" else -1
+        return signs
+
+    @staticmethod
+    def _pack_constraints(constraints: list[dict[str, Any]]) -> tuple[list[str], np.ndarray, np.ndarray]:
+        """Split *constraints* into metric names, operator codes and targets."""
+        metrics: list[str] = []
+        ops: list[int] = []
+        for constraint in constraints:
+            op = constraint["operator"]
+            if op not in CONSTRAINT_OPS:
+                raise ValueError(f"Unsupported constraint operator '{op}'")
+            metrics.append(constraint["metric"])
+            ops.append(CONSTRAINT_OPS[op])
+        targets = np.array([float(c["value"]) for c in constraints], dtype=np.float64)
+        return metrics, np.array(ops, dtype=np.int64), targets
 
     def _evaluate(self, payload: dict[str, Any]) -> dict[str, Any]:
         return CalculationClass(payload).run()
 
-    def _all_constraints_pass(self, simulation: dict[str, Any], constraints: list[dict[str, Any]]) -> bool:
-        return all(self._constraint_passes(simulation, c) for c in constraints)
+    def _evaluate_many(self, payloads: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        return CalculationClass.run_many(payloads)
+
+    def _cache_key(self, assignments: tuple[tuple[str, float], ...]) -> tuple:
+        return (self._fingerprint, tuple((path, round(value, 9)) for path, value in assignments))
+
+    def _evaluate_points(self, points: list[tuple[tuple[str, float], ...]]) -> list[dict[str, Any]]:
+        """Return the summary KPIs of the base payload with each point's assignments applied.
+
+        Cached points are reused; the rest are simulated as one batch. The
+        returned dicts are shared with the cache and must not be mutated.
+        """
+        keys = [self._cache_key(assignments) for assignments in points]
+        kpis = [_cache_get(key) for key in keys]
+        misses = [i for i, point_kpis in enumerate(kpis) if point_kpis is None]
+        payloads = [self._with_values(self.base_payload, points[i]) for i in misses]
+        for i, simulation in zip(misses, self._evaluate_many(payloads)):
+            kpis[i] = self._summary_kpis(simulation)
+            _cache_put(keys[i], kpis[i])
+        return kpis
+
+    def run_job(self, job: dict[str, Any]) -> dict[str, Any]:
+        """Dispatch *job* to the handler for its ``mode``."""
+        mode = job.get("mode")
+        if mode == "single_variable_goal_seek":
+            return self.single_variable_goal_seek(job)
+        if mode == "multi_variable":
+            return self.multi_variable_optimize(job)
+        if mode == "multi_variable_zoom":
+            return self.multi_variable_optimize_zoom(job)
+        if mode == "sensitivity_heatmap":
+            return self.dynamic_sensitivity_heatmap(job)
+        raise ValueError(
+            "optimization_job.mode must be one of: single_variable_goal_seek, multi_variable, "
+            "multi_variable_zoom, sensitivity_heatmap"
+        )
 
     def single_variable_goal_seek(self, job: dict[str, Any]) -> dict[str, Any]:
-        """OPT-01 bisection goal seek.
+        """OPT-01 goal seek (false position, falling back to bisection).
 
         Expects:
           {
@@ -81,6 +271,11 @@ class OptimizerService:
                 "tolerance": 0.01
             }
           }
+
+        ``tolerance`` applies to the KPI error. An optional ``x_tolerance``
+        stops the search once the bracket on the decision variable is that
+        narrow, which bounds bisection at ``ceil(log2((max - min) / x_tolerance))``
+        steps even when the KPI never gets within ``tolerance``.
         """
         target_metric = job["target_variable"]
         target_value = float(job["target_value"])
@@ -90,13 +285,15 @@ class OptimizerService:
         hi = float(decision_var["max"])
         tol = float(decision_var.get("tolerance", 0.01))
         max_iter = int(decision_var.get("max_iterations", 50))
+        x_tol = float(decision_var.get("x_tolerance", 0.0))
+        if x_tol < 0:
+            raise ValueError("decision_variable.x_tolerance must be non-negative")
 
         best: tuple[float, float, dict[str, Any], dict[str, Any]] | None = None
 
-        for _ in range(max_iter):
-            mid = (lo + hi) / 2
-            candidate_payload = copy.deepcopy(self.base_payload)
-            self._set_nested(candidate_payload, path, mid)
+        def residual(x: float) -> float:
+            nonlocal best
+            candidate_payload = self._with_values(self.base_payload, ((path, x),))
             sim = self._evaluate(candidate_payload)
             kpi = self._get_kpi(sim, target_metric)
             if kpi is None:
@@ -104,16 +301,55 @@ class OptimizerService:
 
             err = abs(kpi - target_value)
             if best is None or err < best[0]:
-                best = (err, mid, candidate_payload, sim)
-
-            if err <= tol:
-                break
-
-            # assumes monotonic relationship for bisection use-cases
-            if kpi > target_value:
-                lo = mid
-            else:
-                hi = mid
+                best = (err, x, candidate_payload, sim)
+            return kpi - target_value
+
+        def converged() -> bool:
+            return best is not None and best[0] <= tol
+
+        # When the bounds bracket the target, Illinois false position converges
+        # superlinearly on smooth KPIs; otherwise fall back to plain bisection.
+        evaluations = 0
+        bracketed = False
+        if max_iter >= 2:
+            f_lo = residual(lo)
+            f_hi = residual(hi)
+            evaluations = 2
+            bracketed = (f_lo < 0.0) != (f_hi < 0.0)
+
+        if bracketed:
+            a, f_a, b, f_b = lo, f_lo, hi, f_hi
+            last_side = 0
+            while evaluations < max_iter and not converged() and b - a > x_tol:
+                x = b - f_b * (b - a) / (f_b - f_a)
+                if not a < x < b:
+                    x = (a + b) / 2
+                f_x = residual(x)
+                evaluations += 1
+
+                if (f_x < 0.0) == (f_a < 0.0):
+                    a, f_a = x, f_x
+                    if last_side == -1:
+                        f_b /= 2
+                    last_side = -1
+                else:
+                    b, f_b = x, f_x
+                    if last_side == 1:
+                        f_a /= 2
+                    last_side = 1
+        else:
+            if x_tol > 0 and hi > lo:
+                max_iter = min(max_iter, evaluations + math.ceil(math.log2(max((hi - lo) / x_tol, 1.0))))
+            while evaluations < max_iter and not converged() and hi - lo > x_tol:
+                mid = (lo + hi) / 2
+                kpi_err = residual(mid)
+                evaluations += 1
+
+                # assumes monotonic relationship for bisection use-cases
+                if kpi_err > 0:
+                    lo = mid
+                else:
+                    hi = mid
 
         if best is None:
             raise ValueError("Goal seek failed to find a candidate")
@@ -128,129 +364,251 @@ class OptimizerService:
                 "solved_value": solved_value,
             },
             "simulation_results": solved_sim["simulation_results"],
-            "resolved_payload": solved_payload,
+            "resolved_payload": _clone(solved_payload),
         }
 
     def multi_variable_optimize(self, job: dict[str, Any]) -> dict[str, Any]:
-        """OPT-02 multi-variable grid search with constraints."""
-        target_metric = job["target_variable"]
-        goal = job.get("goal", "maximize")
-        constraints = job.get("constraints", [])
-        decision_variables = job["decision_variables"]
+        """OPT-02 multi-variable grid search with constraints.
+
+        A decision variable may declare how KPIs respond to it, e.g.
+        ``"monotone": {"moic": "decreasing"}`` (non-strict). The last variable
+        with such a declaration is swept innermost, in ascending order, and a
+        sweep stops early once a constraint on a declared KPI fails in a way
+        larger values cannot repair, or once the declared objective can no
+        longer beat the incumbent. Tested/feasible counts cover evaluated
+        scenarios only.
+        """
+        best, tested, feasible = self._grid_search(job)
+        return self._multi_variable_result(job, "multi_variable", best, tested, feasible)
+
+    def multi_variable_optimize_zoom(
+        self, job: dict[str, Any], zoom_levels: int = 3, refine_factor: int = 5
+    ) -> dict[str, Any]:
+        """OPT-02 coarse-to-fine grid search.
+
+        The first pass uses each variable's ``step`` times ``refine_factor``.
+        Each later pass re-centres every axis on the incumbent, spanning one
+        previous step either side, with the step divided by ``refine_factor``.
+        Passes stop after ``zoom_levels`` or once every step is at or below
+        the variable's ``tolerance`` (default: its ``step``). A pass only
+        replaces the incumbent when it improves on it. Points shared between
+        passes come from the KPI cache.
+        """
+        zoom_levels = int(job.get("zoom_levels", zoom_levels))
+        refine_factor = int(job.get("refine_factor", refine_factor))
+        if zoom_levels < 1 or refine_factor < 1:
+            raise ValueError("zoom_levels and refine_factor must be at least 1")
 
-        var_names = list(decision_variables.keys())
-        if len(var_names) == 0:
+        specs = {key: dict(spec) for key, spec in job["decision_variables"].items()}
+        if not specs:
             raise ValueError("No decision variables provided")
+        tolerances = {key: float(spec.get("tolerance", spec["step"])) for key, spec in specs.items()}
+        bounds = {key: (float(spec["min"]), float(spec["max"])) for key, spec in specs.items()}
+        for key, spec in specs.items():
+            spec["step"] = max(float(spec["step"]) * refine_factor, tolerances[key])
 
-        grids: list[list[float]] = []
-        for key in var_names:
-            spec = decision_variables[key]
-            start = float(spec["min"])
-            stop = float(spec["max"])
-            step = float(spec["step"])
-            values: list[float] = []
-            v = start
-            while v <= stop + 1e-9:
-                values.append(round(v, 6))
-                v += step
-            grids.append(values)
-
+        goal_sign = {"maximize": 1, "minimize": -1}.get(job.get("goal", "maximize"), 0)
         best: Candidate | None = None
         tested = 0
         feasible = 0
+        levels = 0
+        while levels < zoom_levels:
+            level_best, level_tested, level_feasible = self._grid_search({**job, "decision_variables": specs})
+            levels += 1
+            tested += level_tested
+            feasible += level_feasible
+            if level_best is None:
+                break
+            # A refined grid clamped to ``tolerance`` need not contain the
+            # previous centre, so a pass can come back worse than the incumbent.
+            if best is None or goal_sign * (level_best.objective_value - best.objective_value) > 0:
+                best = level_best
+            if all(float(spec["step"]) <= tolerances[key] for key, spec in specs.items()):
+                break
 
-        def visit(idx: int, payload: dict[str, Any]) -> None:
-            nonlocal tested, feasible, best
-            if idx == len(var_names):
-                tested += 1
-                simulation = self._evaluate(payload)
-                if not self._all_constraints_pass(simulation, constraints):
-                    return
-                feasible += 1
-                metric_value = self._get_kpi(simulation, target_metric)
-                if metric_value is None:
-                    return
-
-                if best is None:
-                    best = Candidate(metric_value, copy.deepcopy(payload), simulation)
-                    return
-
-                if goal == "maximize" and metric_value > best.objective_value:
-                    best = Candidate(metric_value, copy.deepcopy(payload), simulation)
-                elif goal == "minimize" and metric_value < best.objective_value:
-                    best = Candidate(metric_value, copy.deepcopy(payload), simulation)
-                return
-
-            key = var_names[idx]
-            for v in grids[idx]:
-                path = (
-                    key
-                    if "." in key
-                    else (
-                        f"asset_parameters.{key}"
-                        if key in payload.get("asset_parameters", {})
-                        else f"financial_assumptions.{key}"
-                    )
-                )
-                candidate = copy.deepcopy(payload)
-                self._set_nested(candidate, path, v)
-                visit(idx + 1, candidate)
-
-        visit(0, copy.deepcopy(self.base_payload))
-
+            centres = [value for _, value in best.assignments]
+            for (key, spec), centre in zip(specs.items(), centres):
+                lo, hi = bounds[key]
+                step = float(spec["step"])
+                spec["min"] = max(lo, centre - step)
+                spec["max"] = min(hi, centre + step)
+                spec["step"] = max(step / refine_factor, tolerances[key])
+
+        result = self._multi_variable_result(job, "multi_variable_zoom", best, tested, feasible)
+        result["optimization_job"]["zoom_levels_run"] = levels
+        return result
+
+    def _multi_variable_result(
+        self, job: dict[str, Any], mode: str, best: Candidate | None, tested: int, feasible: int
+    ) -> dict[str, Any]:
         if best is None:
             raise ValueError("No feasible solution found for optimization job")
 
         return {
             "optimization_job": {
-                "mode": "multi_variable",
-                "target_variable": target_metric,
-                "goal": goal,
+                "mode": mode,
+                "target_variable": job["target_variable"],
+                "goal": job.get("goal", "maximize"),
                 "tested_scenarios": tested,
                 "feasible_scenarios": feasible,
                 "objective_value": best.objective_value,
             },
             "best_configuration": {
-                "asset_parameters": best.payload.get("asset_parameters", {}),
-                "financial_assumptions": best.payload.get("financial_assumptions", {}),
+                "asset_parameters": _clone(best.payload.get("asset_parameters", {})),
+                "financial_assumptions": _clone(best.payload.get("financial_assumptions", {})),
             },
-            "simulation_results": best.simulation["simulation_results"],
+            # Re-simulated rather than cached, so the response owns its data.
+            "simulation_results": self._evaluate(best.payload)["simulation_results"],
         }
 
+    def _grid_search(self, job: dict[str, Any]) -> tuple[Candidate | None, int, int]:
+        """Search the decision-variable grid; return ``(best, tested, feasible)``."""
+        target_metric = job["target_variable"]
+        goal = job.get("goal", "maximize")
+        constraints = job.get("constraints", [])
+        decision_variables = job["decision_variables"]
+
+        var_names = list(decision_variables.keys())
+        if len(var_names) == 0:
+            raise ValueError("No decision variables provided")
+
+        grids = [_grid_values(decision_variables[key]) for key in var_names]
+
+        metrics, ops, targets = self._pack_constraints(constraints)
+        goal_sign = {"maximize": 1, "minimize": -1}.get(goal, 0)
+
+        best: Candidate | None = None
+        tested = 0
+        feasible = 0
+
+        base_assets = self.base_payload.get("asset_parameters", {})
+        paths = [
+            key
+            if "." in key
+            else (f"asset_parameters.{key}" if key in base_assets else f"financial_assumptions.{key}")
+            for key in var_names
+        ]
+
+        def reduce(
+            points: list[tuple[tuple[str, float], ...]],
+            kpis: list[dict[str, Any]],
+        ) -> None:
+            nonlocal best, tested, feasible
+            # Missing KPIs become NaN, which fails every constraint.
+            values = np.array([[k.get(m) for m in metrics] for k in kpis], dtype=np.float64)
+            objective = np.array([k.get(target_metric) for k in kpis], dtype=np.float64)
+
+            batch_feasible, i, _ = _scan_leaves(
+                values.reshape(len(points), len(metrics)),
+                ops,
+                targets,
+                objective,
+                goal_sign,
+                math.nan if best is None else float(best.objective_value),
+            )
+            tested += len(points)
+            feasible += batch_feasible
+            if i >= 0:
+                best = Candidate(
+                    kpis[i][target_metric],
+                    self._with_values(self.base_payload, points[i]),
+                    points[i],
+                )
+
+        monotone = [self._monotone_signs(decision_variables[key]) for key in var_names]
+        axis = max((i for i, signs in enumerate(monotone) if signs), default=None)
+
+        if axis is None:
+            # Leaves are independent, so they are evaluated in batches (one
+            # engine JIT call per batch) and reduced in grid order.
+            leaves = itertools.product(*grids)
+            while chunk := list(itertools.islice(leaves, LEAF_BATCH_SIZE)):
+                points = [tuple(zip(paths, combo)) for combo in chunk]
+                reduce(points, self._evaluate_points(points))
+        else:
+            signs = monotone[axis]
+            checks = [(m, int(op), float(t), signs.get(m, 0)) for m, op, t in zip(metrics, ops, targets)]
+            objective_worsens = goal_sign != 0 and signs.get(target_metric) == -goal_sign
+
+            def line_exhausted(kpis: dict[str, Any]) -> bool:
+                """True when no larger ``axis`` value on this line can pass or win."""
+                passes = True
+                for metric, op, target, sign in checks:
+                    v = kpis.get(metric)
+                    if v is None:
+                        passes = False
+                    elif op == OP_LESS_THAN and v >= target or op == OP_LESS_THAN_EQUAL and v > target:
+                        if sign > 0:
+                            return True
+                        passes = False
+                    elif op == OP_GREATER_THAN and v <= target or op == OP_GREATER_THAN_EQUAL and v < target:
+                        if sign < 0:
+                            return True
+                        passes = False
+                    elif op == OP_EQUAL and abs(v - target) > 1e-6:
+                        if sign * (v - target) > 0:
+                            return True
+                        passes = False
+
+                if objective_worsens:
+                    v = kpis.get(target_metric)
+                    if v is not None:
+                        # Later points can at best tie this one or the incumbent.
+                        if passes or (best is not None and goal_sign * (v - best.objective_value) <= 0):
+                            return True
+                return False
+
+            # Lines hold every other variable fixed; a batch advances each live
+            # line by one ``axis`` value, then results are reduced line by line.
+            others = [i for i in range(len(var_names)) if i != axis]
+            lines = itertools.product(*(grids[i] for i in others))
+            while chunk := list(itertools.islice(lines, LEAF_BATCH_SIZE)):
+                evaluated: list[list[tuple[tuple[tuple[str, float], ...], dict[str, Any]]]] = [[] for _ in chunk]
+                live = list(range(len(chunk)))
+                for axis_value in grids[axis]:
+                    if not live:
+                        break
+                    points = []
+                    for line in live:
+                        combo = dict(zip(others, chunk[line]))
+                        combo[axis] = axis_value
+                        points.append(tuple((paths[i], combo[i]) for i in range(len(var_names))))
+                    still_live = []
+                    for line, point, kpis in zip(live, points, self._evaluate_points(points)):
+                        evaluated[line].append((point, kpis))
+                        if not line_exhausted(kpis):
+                            still_live.append(line)
+                    live = still_live
+
+                results = [item for line in evaluated for item in line]
+                points, kpis = (list(column) for column in zip(*results)) if results else ([], [])
+                reduce(points, kpis)
+
+        return best, tested, feasible
+
     def dynamic_sensitivity_heatmap(self, heatmap: dict[str, Any]) -> dict[str, Any]:
         """OPT-03 heatmap generation across 2 dimensions."""
         x_spec = heatmap["x_axis"]
         y_spec = heatmap["y_axis"]
         z_metric = heatmap["z_metric"]
 
-        def build_values(spec: dict[str, Any]) -> list[float]:
-            start = float(spec["min"])
-            stop = float(spec["max"])
-            step = float(spec["step"])
-            out: list[float] = []
-            v = start
-            while v <= stop + 1e-9:
-                out.append(round(v, 6))
-                v += step
-            return out
-
-        x_values = build_values(x_spec)
-        y_values = build_values(y_spec)
-
-        matrix: list[dict[str, float | None]] = []
-
-        for y in y_values:
-            for x in x_values:
-                payload = copy.deepcopy(self.base_payload)
-                self._set_nested(payload, x_spec["path"], x)
-                self._set_nested(payload, y_spec["path"], y)
-                simulation = self._evaluate(payload)
-                z = self._get_kpi(simulation, z_metric)
-                matrix.append({
-                    "x": x,
-                    "y": y,
-                    "z": z,
-                })
+        x_values = _grid_values(x_spec)
+        y_values = _grid_values(y_spec)
+
+        x_path = x_spec["path"]
+        y_path = y_spec["path"]
+        grid_x, grid_y = np.meshgrid(x_values, y_values, indexing="xy")
+        points = list(zip(grid_x.ravel().tolist(), grid_y.ravel().tolist()))
+        kpis = self._evaluate_points([((x_path, x), (y_path, y)) for x, y in points])
+
+        matrix: list[dict[str, float | None]] = [
+            {
+                "x": x,
+                "y": y,
+                "z": point_kpis.get(z_metric),
+            }
+            for (x, y), point_kpis in zip(points, kpis)
+        ]
 
         return {
             "optimization_job": {
@@ -261,3 +619,8 @@ class OptimizerService:
             },
             "points": matrix,
         }
+
+
+def run_optimization_job(payload: dict[str, Any]) -> dict[str, Any]:
+    """Run ``payload["optimization_job"]`` against *payload* (worker-pool entry point)."""
+    return OptimizerService(payload).run_job(payload["optimization_job"])
@@ -0,0 +1,26 @@
+"""Optional Numba JIT support.
+
+Numeric kernels are decorated with :func:`njit` from this module. When Numba
+is installed they are compiled to machine code (and cached on disk); when it
+is not, the decorator is a no-op and the kernels run as plain Python, so the
+engine keeps working on platforms without a Numba wheel.
+"""
+
+from __future__ import annotations
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - depends on the environment
+
+    def njit(*args, **kwargs):
+        """Fallback for ``numba.njit`` that returns the function unchanged."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator
+
+
+__all__ = ["njit"]
@@ -4,10 +4,12 @@ optimization backend.
 """
 
 import logging
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=64)
 def compute_crf(wacc: float, years: int) -> float:
     """Capital Recovery Factor.
 
@@ -19,6 +21,17 @@ def compute_crf(wacc: float, years: int) -> float:
     return (wacc * (1 + wacc) ** years) / ((1 + wacc) ** years - 1)
 
 
+@lru_cache(maxsize=256)
+def annual_cost_coefficient(wacc: float, life_years: int, capex: float, om: float = 0.0) -> float:
+    """Annualized cost per MW (or MWh) of capacity.
+
+    *capex* ($/kW or $/kWh) is annualized with :func:`compute_crf` and added
+    to the yearly *om* ($/kW-yr), then scaled by 1000 to a per-MW basis.
+    Cached because cost scenarios repeat the same tuples across solves.
+    """
+    return (capex * compute_crf(wacc, life_years) + om) * 1_000.0
+
+
 def compute_lcoe_gas(
     heat_rate_btu_kwh: float,
     gas_price_per_mmbtu: float = 3.50,
@@ -55,56 +68,24 @@ def compute_lcoe_gas(
     # Fuel cost component: (heat_rate BTU/kWh) * ($/MMBtu) / 1000 -> $/MWh
     fuel_cost_per_mwh = heat_rate_btu_kwh * gas_price_per_mmbtu / 1_000.0
 
-    # Fixed O&M component: $/kW-yr -> $/MWh
-    # hours_per_year * CF gives equivalent full-load hours
+    # Fixed O&M and capex: $/kW-yr / (CF * 8760 h/yr) = $/kWh -> * 1000 = $/MWh
     hours_per_year = 8760
-    if capacity_factor > 0:
-        fixed_om_per_mwh = (fixed_om_per_kw_year * 1_000.0) / (
-            hours_per_year * capacity_factor * 1_000.0
-        )
-        # Simplifies to fixed_om_per_kw_year / (hours_per_year * capacity_factor)
-        fixed_om_per_mwh = fixed_om_per_kw_year / (hours_per_year * capacity_factor)
-    else:
-        fixed_om_per_mwh = 0.0
+    inv_cf_hours = 1.0 / (capacity_factor * hours_per_year) if capacity_factor > 0 else 0.0
+    fixed_om_per_mwh = fixed_om_per_kw_year * 1_000.0 * inv_cf_hours
 
-    # Capital cost component
+    # capex: $/kW -> annualized $/kW-yr via CRF -> $/MWh
     if capex_per_kw > 0 and capacity_factor > 0:
-        crf = compute_crf(wacc, life_years)
-        # $/kW * CRF -> $/kW-yr -> $/MWh
-        capex_per_mwh = (capex_per_kw * crf) / (hours_per_year * capacity_factor) * 1_000.0
-        # Convert to $/MWh properly: capex_per_kw is $/kW
-        capex_per_mwh = (capex_per_kw * crf * 1_000.0) / (
-            hours_per_year * capacity_factor * 1_000.0
-        )
-        capex_per_mwh = (capex_per_kw * crf) / (hours_per_year * capacity_factor)
+        capex_per_mwh = capex_per_kw * compute_crf(wacc, life_years) * 1_000.0 * inv_cf_hours
     else:
         capex_per_mwh = 0.0
 
-    # Convert fixed_om and capex from $/kWh-equivalent to $/MWh
-    lcoe = fuel_cost_per_mwh + fixed_om_per_mwh * 1_000.0 + capex_per_mwh * 1_000.0
-
-    # The above over-converts. Let's redo cleanly:
-    # fuel_cost: $/MWh (already correct)
-    # fixed_om: $/kW-yr / (CF * 8760 h/yr) = $/kW / kWh -> * 1000 kW/MW = $/MWh
-    # capex: same treatment
-    lcoe = fuel_cost_per_mwh  # $/MWh
-
-    # fixed O&M: $/kW-yr -> $/MWh
-    if capacity_factor > 0:
-        lcoe += (fixed_om_per_kw_year / (capacity_factor * hours_per_year)) * 1_000.0
-
-    # capex: $/kW -> annualized $/kW-yr via CRF -> $/MWh
-    if capex_per_kw > 0 and capacity_factor > 0:
-        crf = compute_crf(wacc, life_years)
-        lcoe += (capex_per_kw * crf / (capacity_factor * hours_per_year)) * 1_000.0
+    lcoe = fuel_cost_per_mwh + fixed_om_per_mwh + capex_per_mwh
 
     logger.debug(
         "Gas LCOE: fuel=%.1f  fixed_om=%.1f  capex=%.1f  total=%.1f $/MWh",
         fuel_cost_per_mwh,
-        (fixed_om_per_kw_year / (capacity_factor * hours_per_year) * 1_000.0)
-        if capacity_factor > 0
-        else 0.0,
-        0.0,
+        fixed_om_per_mwh,
+        capex_per_mwh,
         lcoe,
     )
 
@@ -142,26 +123,24 @@ def compute_annual_costs(
         Keys: solar_cost, battery_cost, gas_cost, excess_solar_revenue, total.
         All values in $/year.
     """
-    solar_crf = compute_crf(cost_params["wacc"], cost_params["solar_life_years"])
-    battery_crf = compute_crf(cost_params["wacc"], cost_params["battery_life_years"])
+    wacc = cost_params["wacc"]
+    solar_life = cost_params["solar_life_years"]
+    battery_life = cost_params["battery_life_years"]
 
     # Solar: CAPEX annualized + O&M
-    # CAPEX is $/kW, solar_mw is MW -> multiply by 1000 to get kW
-    solar_capex_annual = (
-        cost_params["solar_capex_per_kw"] * solar_mw * 1_000.0 * solar_crf
+    solar_cost = solar_mw * annual_cost_coefficient(
+        wacc, solar_life, cost_params["solar_capex_per_kw"], cost_params["solar_om_per_kw_year"]
     )
-    solar_om_annual = cost_params["solar_om_per_kw_year"] * solar_mw * 1_000.0
-    solar_cost = solar_capex_annual + solar_om_annual
 
     # Battery: energy CAPEX + power CAPEX annualized + O&M
-    battery_energy_capex_annual = (
-        cost_params["battery_energy_capex_per_kwh"] * batt_energy_mwh * 1_000.0 * battery_crf
-    )
-    battery_power_capex_annual = (
-        cost_params["battery_power_capex_per_kw"] * batt_power_mw * 1_000.0 * battery_crf
+    battery_cost = batt_energy_mwh * annual_cost_coefficient(
+        wacc, battery_life, cost_params["battery_energy_capex_per_kwh"]
+    ) + batt_power_mw * annual_cost_coefficient(
+        wacc,
+        battery_life,
+        cost_params["battery_power_capex_per_kw"],
+        cost_params["battery_om_per_kw_year"],
     )
-    battery_om_annual = cost_params["battery_om_per_kw_year"] * batt_power_mw * 1_000.0
-    battery_cost = battery_energy_capex_annual + battery_power_capex_annual + battery_om_annual
 
     # Gas: variable cost only (existing plant, no new capex)
     gas_cost = gas_gen_mwh * gas_variable_cost
@@ -1,19 +1,30 @@
 """
-MILP formulation for hybrid solar+storage optimization using PuLP.
+MILP formulation for hybrid solar+storage optimization.
 
 Uses representative days (24 hours x 12 months = 288 time steps) for fast
-solving.  The HiGHS solver (open-source, bundled with PuLP) is used by
-default with a 120-second time limit.
+solving.  The model is assembled directly as NumPy arrays (objective plus a
+sparse row-wise constraint matrix).  HiGHS is used by default and receives
+those arrays in-process through its ``highspy`` bindings; CBC (bundled with
+PuLP) can be selected instead for comparison.  Both run with a 120-second
+time limit.
 """
 
 from __future__ import annotations
 
 import logging
 import math
+import threading
+from dataclasses import dataclass
 
+import numpy as np
 import pulp
 
-from optimizer.lcoe import compute_crf
+try:
+    import highspy
+except ImportError:  # pragma: no cover - depends on the environment
+    highspy = None
+
+from optimizer.lcoe import annual_cost_coefficient
 
 logger = logging.getLogger(__name__)
 
@@ -25,18 +36,270 @@ MONTHS = 12
 HOURS_PER_DAY = 24
 DAYS_PER_MONTH = 365.0 / 12  # ~30.42
 TIME_LIMIT_SEC = 120
+SOLVERS = ("highs", "cbc")
+DISPATCH_FORMATS = ("aos", "soa")
+
+# Dispatch variables, in LP block order
+SOLAR, CHARGE, DISCHARGE, GAS, SOC = range(5)
+
+# LP column layout: three capacity columns, then one 288-hour block per
+# dispatch variable in the order above.
+COL_SOLAR_CAP, COL_BATT_POWER, COL_BATT_ENERGY = range(3)
+NUM_CAPACITY_COLS = 3
+DISPATCH_VARS = ("solar_gen", "batt_charge", "batt_discharge", "gas_gen", "soc")
+COL_NAMES = ("solar_cap", "batt_power", "batt_energy") + tuple(
+    f"{name}_{t}" for name in DISPATCH_VARS for t in range(HOURS_PER_REPR)
+)
+
+# The LP has many equally cheap dispatches and HiGHS picks among them by
+# column order, so columns are handed to it sorted by name (the order PuLP
+# used) to keep the reported dispatch stable.
+_HIGHS_ORDER = np.array(sorted(range(len(COL_NAMES)), key=COL_NAMES.__getitem__))
+_HIGHS_POSITION = np.argsort(_HIGHS_ORDER)
+
+_scratch = threading.local()
+
+
+@dataclass(slots=True)
+class _LinearProgram:
+    """Dense objective/bounds plus a row-wise (CSR) constraint matrix."""
+
+    cost: np.ndarray
+    col_upper: np.ndarray
+    row_lower: np.ndarray
+    row_upper: np.ndarray
+    start: np.ndarray
+    index: np.ndarray
+    value: np.ndarray
+
+    @property
+    def num_col(self) -> int:
+        return len(self.cost)
+
+    @property
+    def num_row(self) -> int:
+        return len(self.row_lower)
+
+
+def _col(block: int) -> np.ndarray:
+    """Column indices of dispatch block *block* (``SOLAR`` .. ``SOC``)."""
+    first = NUM_CAPACITY_COLS + block * HOURS_PER_REPR
+    return np.arange(first, first + HOURS_PER_REPR)
+
+
+def _build_lp(
+    target_load_mw: float,
+    max_gas_backup_pct: float,
+    solar_profile_288: np.ndarray,
+    gas_capacity_mw: float,
+    gas_op_cost_per_mw: float,
+    capacity_costs: tuple[float, float, float],
+    inverter_eff: float,
+    sqrt_rte: float,
+    max_solar_mw: float | None,
+    conflict_hours: np.ndarray,
+) -> _LinearProgram:
+    """Assemble the hybrid dispatch LP as arrays (all columns are >= 0).
+
+    Each constraint family is emitted as one vectorized block of
+    ``(row, col, coefficient)`` triples, which are then sorted into CSR form.
+    Limits on a single column (gas capacity, conflict hours, solar cap) are
+    column upper bounds rather than rows.
+    """
+    T = HOURS_PER_REPR
+    hours = np.arange(T)
+    profile = np.asarray(solar_profile_288, dtype=np.float64)
+    solar, charge, discharge, gas, soc = (_col(b) for b in (SOLAR, CHARGE, DISCHARGE, GAS, SOC))
+    ones = np.ones(T)
+    inf = math.inf
+
+    cost = np.zeros(NUM_CAPACITY_COLS + len(DISPATCH_VARS) * T)
+    cost[[COL_SOLAR_CAP, COL_BATT_POWER, COL_BATT_ENERGY]] = capacity_costs
+    cost[gas] = gas_op_cost_per_mw
+
+    col_upper = np.full(len(cost), inf)
+    # 10. Gas capacity limit
+    col_upper[gas] = gas_capacity_mw
+    # 12. Conflict hours: no gas allowed
+    col_upper[gas[conflict_hours]] = 0.0
+    # 11. Solar capacity upper bound (if provided)
+    if max_solar_mw is not None:
+        col_upper[COL_SOLAR_CAP] = max_solar_mw
+
+    rows: list[np.ndarray] = []
+    cols: list[np.ndarray] = []
+    vals: list[np.ndarray] = []
+    lower: list[np.ndarray] = []
+    upper: list[np.ndarray] = []
+
+    def add_block(terms, lo, hi) -> None:
+        """Append one row per hour; *terms* is ``[(cols, coefs), ...]``."""
+        first = sum(len(b) for b in lower)
+        n = len(lo)
+        for c, v in terms:
+            rows.append(first + np.arange(n))
+            cols.append(np.broadcast_to(c, (n,)))
+            vals.append(np.broadcast_to(v, (n,)).astype(np.float64))
+        lower.append(np.asarray(lo, dtype=np.float64))
+        upper.append(np.asarray(hi, dtype=np.float64))
+
+    # 1. Energy balance: supply >= demand
+    add_block(
+        [(solar, inverter_eff), (discharge, sqrt_rte), (charge, -1.0 / sqrt_rte), (gas, 1.0)],
+        np.full(T, target_load_mw),
+        np.full(T, inf),
+    )
+    # 2. Solar generation limited by capacity and resource
+    add_block([(solar, 1.0), (COL_SOLAR_CAP, -profile)], np.full(T, -inf), np.zeros(T))
+    # 3-4. Battery charge/discharge limited by power rating
+    add_block([(charge, 1.0), (COL_BATT_POWER, -1.0)], np.full(T, -inf), np.zeros(T))
+    add_block([(discharge, 1.0), (COL_BATT_POWER, -1.0)], np.full(T, -inf), np.zeros(T))
+    # 5. SOC dynamics (cyclic: t=0 wraps from t=287)
+    add_block(
+        [(soc, 1.0), (soc[hours - 1], -1.0), (charge, -1.0), (discharge, 1.0)],
+        np.zeros(T),
+        np.zeros(T),
+    )
+    # 6. SOC upper bound
+    add_block([(soc, 1.0), (COL_BATT_ENERGY, -1.0)], np.full(T, -inf), np.zeros(T))
+
+    # 7. Maximum battery duration: 6-hour limit
+    add_block([(COL_BATT_ENERGY, 1.0), (COL_BATT_POWER, -6.0)], [-inf], [0.0])
+    # 8. Battery power cannot exceed solar capacity
+    add_block([(COL_BATT_POWER, 1.0), (COL_SOLAR_CAP, -1.0)], [-inf], [0.0])
+    # 9. Gas backup limit (fraction of total energy across 288 representative hours)
+    first = sum(len(b) for b in lower)
+    rows.append(np.full(T, first))
+    cols.append(gas)
+    vals.append(ones)
+    lower.append(np.array([-inf]))
+    upper.append(np.array([max_gas_backup_pct * target_load_mw * T]))
+
+    row = np.concatenate(rows)
+    col = np.concatenate(cols)
+    val = np.concatenate(vals)
+    keep = val != 0.0
+    row, col, val = row[keep], col[keep], val[keep]
+    order = np.lexsort((col, row))
+
+    row_lower = np.concatenate(lower)
+    start = np.zeros(len(row_lower) + 1, dtype=np.int32)
+    np.cumsum(np.bincount(row, minlength=len(row_lower)), out=start[1:])
+    return _LinearProgram(
+        cost=cost,
+        col_upper=col_upper,
+        row_lower=row_lower,
+        row_upper=np.concatenate(upper),
+        start=start,
+        index=col[order].astype(np.int32),
+        value=val[order],
+    )
+
+
+def _highs_status(h) -> str:
+    """Map a solved ``highspy.Highs`` model status to PuLP's status names."""
+    status = h.getModelStatus()
+    ms = highspy.HighsModelStatus
+    if status in (ms.kTimeLimit, ms.kIterationLimit) and h.getInfo().objective_function_value == math.inf:
+        return "Not Solved"
+    if status in (ms.kOptimal, ms.kObjectiveBound, ms.kObjectiveTarget, ms.kInterrupt, ms.kTimeLimit, ms.kIterationLimit):
+        return "Optimal"
+    if status in (ms.kInfeasible, ms.kUnboundedOrInfeasible):
+        return "Infeasible"
+    if status == ms.kUnbounded:
+        return "Unbounded"
+    return "Not Solved"
+
+
+def _highs_instance():
+    """Return this thread's ``highspy.Highs`` solver, creating it on first use.
+
+    Solves run on long-lived worker threads, so one instance lives per
+    thread; each solve replaces its model.
+    """
+    h = getattr(_scratch, "highs", None)
+    if h is None:
+        h = _scratch.highs = highspy.Highs()
+        h.setOptionValue("output_flag", False)
+        h.setOptionValue("time_limit", float(TIME_LIMIT_SEC))
+    return h
+
+
+def _solve_highs(lp: _LinearProgram, start_basis=None) -> tuple[np.ndarray, str, object]:
+    """Solve *lp* by passing the arrays straight to an in-process HiGHS model.
+
+    A *start_basis* from an earlier solve seeds the simplex when the model has
+    the same shape (e.g. neighbouring sweep points). Returns the solution, the
+    status and the final basis.
+    """
+    model = highspy.HighsLp()
+    model.num_col_ = lp.num_col
+    model.num_row_ = lp.num_row
+    model.col_cost_ = lp.cost[_HIGHS_ORDER]
+    model.col_lower_ = np.zeros(lp.num_col)
+    model.col_upper_ = lp.col_upper[_HIGHS_ORDER]
+    model.row_lower_ = lp.row_lower
+    model.row_upper_ = lp.row_upper
+    model.a_matrix_.format_ = highspy.MatrixFormat.kRowwise
+    model.a_matrix_.start_ = lp.start
+    model.a_matrix_.index_ = _HIGHS_POSITION[lp.index].astype(np.int32)
+    model.a_matrix_.value_ = lp.value
+
+    h = _highs_instance()
+    h.passModel(model)
+    if (
+        start_basis is not None
+        and start_basis.valid
+        and len(start_basis.col_status) == lp.num_col
+        and len(start_basis.row_status) == lp.num_row
+    ):
+        h.setBasis(start_basis)
+    h.run()
+    x = np.asarray(h.getSolution().col_value, dtype=np.float64)[_HIGHS_POSITION]
+    return x, _highs_status(h), h.getBasis()
+
+
+def _solve_pulp_cbc(lp: _LinearProgram) -> tuple[np.ndarray, str]:
+    """Solve *lp* with CBC through PuLP (kept for solver comparisons)."""
+    prob = pulp.LpProblem("PowerCouple_HybridOpt", pulp.LpMinimize)
+    variables = [
+        pulp.LpVariable(name, lowBound=0, upBound=None if ub == math.inf else ub, cat="Continuous")
+        for name, ub in zip(COL_NAMES, lp.col_upper.tolist())
+    ]
+
+    prob += pulp.LpAffineExpression(zip(variables, lp.cost.tolist())), "Total_Annual_Cost"
+    start = lp.start.tolist()
+    index = lp.index.tolist()
+    value = lp.value.tolist()
+    for i, (lo, hi) in enumerate(zip(lp.row_lower.tolist(), lp.row_upper.tolist())):
+        row = slice(start[i], start[i + 1])
+        expr = pulp.LpAffineExpression((variables[j], v) for j, v in zip(index[row], value[row]))
+        if lo == hi:
+            prob += expr == lo, f"R{i}"
+        else:
+            if lo > -math.inf:
+                prob += expr >= lo, f"R{i}_lo"
+            if hi < math.inf:
+                prob += expr <= hi, f"R{i}_hi"
+
+    prob.solve(pulp.PULP_CBC_CMD(msg=False, timeLimit=TIME_LIMIT_SEC))
+    x = np.fromiter((v.varValue or 0.0 for v in variables), dtype=np.float64, count=len(variables))
+    return x, pulp.LpStatus[prob.status]
 
 
 def build_and_solve(
     target_load_mw: float,
     max_gas_backup_pct: float,
-    solar_profile_288: list[float],
+    solar_profile_288: np.ndarray,
     gas_capacity_mw: float,
     gas_heat_rate: float,
     gas_variable_cost: float,
     cost_params: dict,
     max_solar_mw: float | None = None,
-    conflict_hours: set[int] | None = None,
+    conflict_hours: np.ndarray | None = None,
+    solver: str = "highs",
+    dispatch_format: str = "aos",
+    warm_start_from: dict | None = None,
 ) -> dict:
     """Build and solve the MILP for hybrid solar+storage co-located with gas.
 
@@ -46,8 +309,9 @@ def build_and_solve(
         Constant load to serve every hour (MW).
     max_gas_backup_pct : float
         Maximum fraction of total energy that can come from gas (0-1).
-    solar_profile_288 : list[float]
-        288 capacity-factor values (0-1), one per representative hour.
+    solar_profile_288 : np.ndarray
+        288 capacity-factor values (0-1), one per representative hour. Any
+        float sequence is accepted.
     gas_capacity_mw : float
         Nameplate gas capacity (MW).
     gas_heat_rate : float
@@ -58,13 +322,28 @@ def build_and_solve(
         Cost scenario parameters.
     max_solar_mw : float | None
         Upper bound on solar capacity (MW).  ``None`` means no limit.
-    conflict_hours : set[int] | None
-        Set of representative-hour indices (0-287) where gas is restricted to 0.
+    conflict_hours : np.ndarray | None
+        Boolean mask over the 288 representative hours, True where gas is
+        restricted to 0.
+    solver : str
+        ``"highs"`` (default) or ``"cbc"``.
+    dispatch_format : str
+        ``"aos"`` (default) returns ``hourly_dispatch`` as 288 row dicts;
+        ``"soa"`` returns one 288-long list per field (``hour``, ``solar_mw``,
+        ``battery_mw``, ``gas_mw``, ``load_mw``, ``soc``).
+    warm_start_from : dict | None
+        A previous result of this function (e.g. the last point of a sweep).
+        Its private ``_basis`` warm-starts HiGHS; it is ignored when the model
+        shape differs or the solve uses CBC. Among equally cheap dispatches
+        the one reported may then depend on that previous solve.
 
     Returns
     -------
     dict
         Optimization results including capacities, dispatch, costs, and status.
+        The private ``_basis`` key holds the final HiGHS basis (``None`` for
+        CBC), an opaque object for passing back as *warm_start_from*; it is
+        not part of any API response.
     """
     if len(solar_profile_288) != HOURS_PER_REPR:
         raise ValueError(
@@ -72,14 +351,25 @@ def build_and_solve(
             f"got {len(solar_profile_288)}"
         )
 
-    conflict_hours = conflict_hours or set()
+    if solver not in SOLVERS:
+        raise ValueError(f"solver must be one of {SOLVERS}, got '{solver}'")
+
+    if dispatch_format not in DISPATCH_FORMATS:
+        raise ValueError(f"dispatch_format must be one of {DISPATCH_FORMATS}, got '{dispatch_format}'")
+
+    if conflict_hours is None:
+        conflict_hours = np.zeros(HOURS_PER_REPR, dtype=bool)
+    elif np.shape(conflict_hours) != (HOURS_PER_REPR,):
+        raise ValueError(
+            f"conflict_hours must be a mask of {HOURS_PER_REPR} entries, "
+            f"got shape {np.shape(conflict_hours)}"
+        )
+    else:
+        conflict_hours = np.asarray(conflict_hours, dtype=bool)
 
     # -----------------------------------------------------------------------
     # Derived parameters
     # -----------------------------------------------------------------------
-    solar_crf = compute_crf(cost_params["wacc"], cost_params["solar_life_years"])
-    battery_crf = compute_crf(cost_params["wacc"], cost_params["battery_life_years"])
-
     inverter_eff = cost_params["inverter_efficiency"]
     rte = cost_params["battery_rte"]
     sqrt_rte = math.sqrt(rte)
@@ -89,179 +379,106 @@ def build_and_solve(
     # is DAYS_PER_MONTH.
     scale = DAYS_PER_MONTH  # ~30.42
 
-    # Cost coefficients (annual)
+    # Cost coefficients (annual), cached per (wacc, life, capex, O&M)
+    wacc = cost_params["wacc"]
+    solar_life = cost_params["solar_life_years"]
+    battery_life = cost_params["battery_life_years"]
+
     # Solar: capex * CRF + O&M  ($/kW-yr -> per MW multiply by 1000)
-    solar_annual_per_mw = (
-        cost_params["solar_capex_per_kw"] * solar_crf
-        + cost_params["solar_om_per_kw_year"]
-    ) * 1_000.0  # $/MW-yr
+    solar_annual_per_mw = annual_cost_coefficient(
+        wacc, solar_life, cost_params["solar_capex_per_kw"], cost_params["solar_om_per_kw_year"]
+    )  # $/MW-yr
 
     # Battery energy: capex * CRF  ($/kWh-yr -> per MWh multiply by 1000)
-    batt_energy_annual_per_mwh = (
-        cost_params["battery_energy_capex_per_kwh"] * battery_crf
-    ) * 1_000.0  # $/MWh-yr
+    batt_energy_annual_per_mwh = annual_cost_coefficient(
+        wacc, battery_life, cost_params["battery_energy_capex_per_kwh"]
+    )  # $/MWh-yr
 
     # Battery power: capex * CRF + O&M  ($/kW-yr -> per MW multiply by 1000)
-    batt_power_annual_per_mw = (
-        cost_params["battery_power_capex_per_kw"] * battery_crf
-        + cost_params["battery_om_per_kw_year"]
-    ) * 1_000.0  # $/MW-yr
+    batt_power_annual_per_mw = annual_cost_coefficient(
+        wacc,
+        battery_life,
+        cost_params["battery_power_capex_per_kw"],
+        cost_params["battery_om_per_kw_year"],
+    )  # $/MW-yr
 
     logger.info(
         "Building MILP: target=%.1f MW, max_gas=%.1f%%, %d conflict hours",
         target_load_mw,
         max_gas_backup_pct * 100,
-        len(conflict_hours),
+        np.count_nonzero(conflict_hours),
     )
 
-    # -----------------------------------------------------------------------
-    # Problem and decision variables
-    # -----------------------------------------------------------------------
-    prob = pulp.LpProblem("PowerCouple_HybridOpt", pulp.LpMinimize)
-
-    T = list(range(HOURS_PER_REPR))
-
-    # Capacity variables
-    solar_cap = pulp.LpVariable("solar_cap", lowBound=0, cat="Continuous")
-    batt_power = pulp.LpVariable("batt_power", lowBound=0, cat="Continuous")
-    batt_energy = pulp.LpVariable("batt_energy", lowBound=0, cat="Continuous")
-
-    # Dispatch variables (indexed over 288 hours)
-    solar_gen = pulp.LpVariable.dicts("solar_gen", T, lowBound=0, cat="Continuous")
-    batt_charge = pulp.LpVariable.dicts("batt_charge", T, lowBound=0, cat="Continuous")
-    batt_discharge = pulp.LpVariable.dicts("batt_discharge", T, lowBound=0, cat="Continuous")
-    gas_gen = pulp.LpVariable.dicts("gas_gen", T, lowBound=0, cat="Continuous")
-    soc = pulp.LpVariable.dicts("soc", T, lowBound=0, cat="Continuous")
-
-    # -----------------------------------------------------------------------
-    # Objective: minimize annualized total cost
-    # -----------------------------------------------------------------------
-    # Capacity costs (already annualized)
-    capacity_cost = (
-        solar_annual_per_mw * solar_cap
-        + batt_energy_annual_per_mwh * batt_energy
-        + batt_power_annual_per_mw * batt_power
+    lp = _build_lp(
+        target_load_mw=target_load_mw,
+        max_gas_backup_pct=max_gas_backup_pct,
+        solar_profile_288=solar_profile_288,
+        gas_capacity_mw=gas_capacity_mw,
+        gas_op_cost_per_mw=gas_variable_cost * scale,
+        capacity_costs=(solar_annual_per_mw, batt_power_annual_per_mw, batt_energy_annual_per_mwh),
+        inverter_eff=inverter_eff,
+        sqrt_rte=sqrt_rte,
+        max_solar_mw=max_solar_mw,
+        conflict_hours=conflict_hours,
     )
 
-    # Operational costs: gas variable cost scaled to annual
-    gas_op_cost = gas_variable_cost * scale * pulp.lpSum(gas_gen[t] for t in T)
-
-    prob += capacity_cost + gas_op_cost, "Total_Annual_Cost"
-
-    # -----------------------------------------------------------------------
-    # Constraints
-    # -----------------------------------------------------------------------
-    for t in T:
-        # 1. Energy balance: supply >= demand
-        prob += (
-            solar_gen[t] * inverter_eff
-            + batt_discharge[t] * sqrt_rte
-            - batt_charge[t] / sqrt_rte
-            + gas_gen[t]
-            >= target_load_mw
-        ), f"EnergyBalance_{t}"
-
-        # 2. Solar generation limited by capacity and resource
-        prob += (
-            solar_gen[t] <= solar_cap * solar_profile_288[t]
-        ), f"SolarLimit_{t}"
-
-        # 3. Battery charge limited by power rating
-        prob += batt_charge[t] <= batt_power, f"ChargeLimit_{t}"
-
-        # 4. Battery discharge limited by power rating
-        prob += batt_discharge[t] <= batt_power, f"DischargeLimit_{t}"
-
-        # 5. SOC dynamics (cyclic: t=0 wraps from t=287)
-        t_prev = T[-1] if t == 0 else t - 1
-        prob += (
-            soc[t] == soc[t_prev] + batt_charge[t] - batt_discharge[t]
-        ), f"SOC_Dynamics_{t}"
-
-        # 6. SOC upper bound
-        prob += soc[t] <= batt_energy, f"SOC_Upper_{t}"
-
-        # 10. Gas capacity limit
-        prob += gas_gen[t] <= gas_capacity_mw, f"GasCap_{t}"
-
-        # 12. Conflict hours: no gas allowed
-        if t in conflict_hours:
-            prob += gas_gen[t] == 0, f"ConflictHour_{t}"
-
-    # 7. Maximum battery duration: 6-hour limit
-    prob += batt_energy <= 6 * batt_power, "MaxBattDuration"
-
-    # 8. Battery power cannot exceed solar capacity
-    prob += batt_power <= solar_cap, "BattPowerLimit"
-
-    # 9. Gas backup limit (fraction of total energy across 288 representative hours)
-    prob += (
-        pulp.lpSum(gas_gen[t] for t in T)
-        <= max_gas_backup_pct * target_load_mw * HOURS_PER_REPR
-    ), "GasBackupLimit"
-
-    # 11. Solar capacity upper bound (if provided)
-    if max_solar_mw is not None:
-        prob += solar_cap <= max_solar_mw, "SolarCapLimit"
-
     # -----------------------------------------------------------------------
     # Solve
     # -----------------------------------------------------------------------
-    solver = pulp.HiGHS_CMD(msg=False, timeLimit=TIME_LIMIT_SEC)
-    logger.info("Launching HiGHS solver (time limit %ds)...", TIME_LIMIT_SEC)
-    try:
-        prob.solve(solver)
-    except pulp.PulpSolverError:
-        logger.warning("HiGHS executable not available; falling back to CBC solver")
-        fallback = pulp.PULP_CBC_CMD(msg=False, timeLimit=TIME_LIMIT_SEC)
-        prob.solve(fallback)
-
-    status = pulp.LpStatus[prob.status]
-    logger.info("Solver finished: status=%s  objective=%.0f", status, pulp.value(prob.objective) or 0)
-
-    if prob.status not in (pulp.constants.LpStatusOptimal,):
+    if solver == "highs" and highspy is None:
+        logger.warning("highspy not available; falling back to CBC solver")
+        solver = "cbc"
+
+    logger.info("Launching %s solver (time limit %ds)...", solver.upper(), TIME_LIMIT_SEC)
+    basis = None
+    if solver == "highs":
+        start_basis = warm_start_from.get("_basis") if warm_start_from else None
+        x, status, basis = _solve_highs(lp, start_basis=start_basis)
+    else:
+        x, status = _solve_pulp_cbc(lp)
+
+    objective_value = float(lp.cost @ x)
+    logger.info("Solver finished: status=%s  objective=%.0f", status, objective_value)
+
+    if status != "Optimal":
         logger.warning("Solver did not find optimal solution. Status: %s", status)
 
     # -----------------------------------------------------------------------
     # Extract results
     # -----------------------------------------------------------------------
-    sol_solar_cap = pulp.value(solar_cap) or 0.0
-    sol_batt_power = pulp.value(batt_power) or 0.0
-    sol_batt_energy = pulp.value(batt_energy) or 0.0
-
-    hourly_dispatch = []
-    total_gas_gen = 0.0
-    total_solar_gen = 0.0
-
-    for t in T:
-        s = pulp.value(solar_gen[t]) or 0.0
-        bc = pulp.value(batt_charge[t]) or 0.0
-        bd = pulp.value(batt_discharge[t]) or 0.0
-        g = pulp.value(gas_gen[t]) or 0.0
-        sc = pulp.value(soc[t]) or 0.0
-
-        # Net battery contribution (positive = discharging)
-        batt_net = bd * sqrt_rte - bc / sqrt_rte
-
-        hourly_dispatch.append({
-            "hour": t,
-            "solar_mw": round(s * inverter_eff, 4),
-            "battery_mw": round(batt_net, 4),
-            "gas_mw": round(g, 4),
-            "load_mw": round(target_load_mw, 4),
-            "soc": round(sc, 4),
-        })
-
-        total_gas_gen += g
-        total_solar_gen += s
+    sol_solar_cap = float(x[COL_SOLAR_CAP])
+    sol_batt_power = float(x[COL_BATT_POWER])
+    sol_batt_energy = float(x[COL_BATT_ENERGY])
+
+    # One (5, 288) view of the solution, one row per dispatch variable
+    dispatch = x[NUM_CAPACITY_COLS:].reshape(SOC + 1, HOURS_PER_REPR)
+
+    # Net battery contribution (positive = discharging)
+    batt_net = dispatch[DISCHARGE] * sqrt_rte - dispatch[CHARGE] / sqrt_rte
+
+    # Exactly rounded sums, so large solar builds don't lose ULPs in the totals
+    total_gas_gen = math.fsum(dispatch[GAS].tolist())
+    total_solar_gen = math.fsum(dispatch[SOLAR].tolist())
+
+    load_r = round(target_load_mw, 4)
+    columns = {
+        "hour": list(range(HOURS_PER_REPR)),
+        "solar_mw": np.round(dispatch[SOLAR] * inverter_eff, 4).tolist(),
+        "battery_mw": np.round(batt_net, 4).tolist(),
+        "gas_mw": np.round(dispatch[GAS], 4).tolist(),
+        "load_mw": [load_r] * HOURS_PER_REPR,
+        "soc": np.round(dispatch[SOC], 4).tolist(),
+    }
+    if dispatch_format == "soa":
+        hourly_dispatch = columns
+    else:
+        hourly_dispatch = [dict(zip(columns, row)) for row in zip(*columns.values())]
 
     # Scale to annual totals
     annual_gas_gen_mwh = total_gas_gen * scale
     annual_solar_gen_mwh = total_solar_gen * scale
     annual_load_mwh = target_load_mw * 8760
 
-    objective_value = pulp.value(prob.objective) or 0.0
-
     return {
         "solar_capacity_mw": round(sol_solar_cap, 3),
         "battery_power_mw": round(sol_batt_power, 3),
@@ -272,4 +489,5 @@ def build_and_solve(
         "solar_gen_total": round(annual_solar_gen_mwh, 2),
         "solver_status": status,
         "objective_value": round(objective_value, 2),
+        "_basis": basis,
     }
@@ -7,8 +7,12 @@ from __future__ import annotations
 
 import logging
 import math
-import random
+import threading
+from functools import lru_cache
 
+import numpy as np
+
+from optimizer.jit import njit
 from optimizer.lcoe import compute_annual_costs, compute_crf, compute_lcoe_gas
 from optimizer.model import build_and_solve
 
@@ -25,12 +29,36 @@ DEFAULT_GAS_FIXED_OM = 15.0        # $/kW-yr
 # Emissions factor for natural gas: 53.1 kg CO2 per MMBtu
 CO2_KG_PER_MMBTU = 53.1
 
+# Seasonal driver per month (0=Jan .. 11=Dec) for the synthetic solar model:
+# peaks in June, troughs in December
+_MONTH_SIN = np.sin(np.radians(30.0 * (np.arange(12) - 2.5)))
+
+# Hour offset at which each month starts in an 8760-hour (non-leap) year,
+# with the year-end offset appended
+_MONTH_START_HOUR = np.cumsum([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]) * 24
+
+_scratch = threading.local()
+
+
+def _profile_scratch() -> np.ndarray:
+    """Return this thread's 288-element float64 work buffer.
+
+    Profile generation and conflict-hour weighting stage intermediate values
+    here instead of allocating per call. The buffer is overwritten by the
+    next use on the same thread, so only fresh arrays derived from it (for
+    example by ``np.round``) may be returned.
+    """
+    buf = getattr(_scratch, "profile", None)
+    if buf is None:
+        buf = _scratch.profile = np.empty(288, dtype=np.float64)
+    return buf
+
 
 # ---------------------------------------------------------------------------
 # Synthetic solar profile generation
 # ---------------------------------------------------------------------------
 
-def generate_synthetic_solar_profile(latitude: float) -> list[float]:
+def generate_synthetic_solar_profile(latitude: float) -> np.ndarray:
     """Generate a 288-hour synthetic solar profile (12 months x 24 hours).
 
     Uses a simple trigonometric model:
@@ -46,50 +74,53 @@ def generate_synthetic_solar_profile(latitude: float) -> list[float]:
 
     Returns
     -------
-    list[float]
-        288 capacity-factor values in [0, 1].
+    np.ndarray
+        288 capacity-factor values in [0, 1] (float64). The array is cached
+        and shared between calls at the same latitude, so it is read-only.
     """
-    profile = []
-    abs_lat = abs(latitude)
-
-    for month in range(12):  # 0=Jan .. 11=Dec
-        # Solar declination approximation (degrees)
-        # Peaks in June (month 5), trough in December (month 11)
-        declination = 23.45 * math.sin(math.radians((360 / 12) * (month - 2.5)))
-
-        # Day length proxy (hours of usable sun, 6-14h range)
-        day_length = 12.0 + 2.5 * math.sin(math.radians((360 / 12) * (month - 2.5)))
-        # Adjust for latitude -- higher latitudes get more seasonal swing
-        lat_factor = abs_lat / 90.0
-        day_length += 2.0 * lat_factor * math.sin(
-            math.radians((360 / 12) * (month - 2.5))
-        )
+    return _cached_synthetic_profile(abs(latitude))
+
+
+@lru_cache(maxsize=256)
+def _cached_synthetic_profile(abs_lat: float) -> np.ndarray:
+    """Synthetic profile for ``abs_lat``, memoized (the model only uses |lat|)."""
+    buf = _profile_scratch()
+    _synthetic_profile_kernel(abs_lat, _MONTH_SIN, buf)
+    profile = np.round(buf, 5)
+    profile.flags.writeable = False
+    return profile
+
+
+@njit(cache=True)
+def _synthetic_profile_kernel(abs_lat, month_sin, out):
+    """Fill ``out`` (288) with the unrounded synthetic capacity factors."""
+    lat_factor = abs_lat / 90.0
+    for m in range(12):
+        season = month_sin[m]
+
+        # Day length proxy (hours of usable sun, 8-16h range); higher
+        # latitudes get more seasonal swing
+        day_length = 12.0 + 2.5 * season + 2.0 * lat_factor * season
         day_length = max(8.0, min(16.0, day_length))
 
         sunrise = 12.0 - day_length / 2.0
         sunset = 12.0 + day_length / 2.0
 
-        # Peak CF for this month (base ~0.22 at equator, higher in summer
-        # at mid-latitudes due to clearer skies assumption)
-        peak_cf = 0.22 + 0.08 * math.sin(math.radians((360 / 12) * (month - 2.5)))
-        # Latitude adjustment: lower latitudes -> slightly higher annual CF
-        peak_cf += 0.05 * (1.0 - abs_lat / 60.0)
+        # Peak CF for this month (base ~0.22 at equator, higher in summer at
+        # mid-latitudes due to clearer skies assumption); lower latitudes
+        # get a slightly higher annual CF
+        peak_cf = 0.22 + 0.08 * season + 0.05 * (1.0 - abs_lat / 60.0)
         peak_cf = max(0.10, min(0.40, peak_cf))
 
+        # Cosine shape centered at solar noon, masked (0/1) to sunrise..sunset
+        # so the hour loop has no data-dependent branch
         for hour in range(24):
-            if sunrise <= hour <= sunset:
-                # Cosine shape centered at solar noon
-                angle = math.pi * (hour - 12.0) / (day_length / 2.0)
-                cf = peak_cf * max(0.0, math.cos(angle))
-            else:
-                cf = 0.0
+            daylight = 1.0 if sunrise <= hour <= sunset else 0.0
+            angle = math.pi * (hour - 12.0) / (day_length / 2.0)
+            out[m * 24 + hour] = daylight * peak_cf * max(0.0, math.cos(angle))
 
-            profile.append(round(cf, 5))
 
-    return profile
-
-
-def compress_to_representative_days(profile_8760: list[float]) -> list[float]:
+def compress_to_representative_days(profile_8760: list[float]) -> np.ndarray:
     """Average each month's hourly profiles into a single representative day
     per month.
 
@@ -100,30 +131,32 @@ def compress_to_representative_days(profile_8760: list[float]) -> list[float]:
 
     Returns
     -------
-    list[float]
-        288 capacity-factor values (12 months x 24 hours).
+    np.ndarray
+        288 capacity-factor values (12 months x 24 hours, float64).
     """
     if len(profile_8760) != 8760:
         raise ValueError(f"Expected 8760 hours, got {len(profile_8760)}")
 
-    # Days per month (non-leap year)
-    days_in_month = [31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
-    profile_288 = []
+    buf = _profile_scratch()
+    _month_average_kernel(np.asarray(profile_8760, dtype=np.float64), _MONTH_START_HOUR, buf)
+    return np.round(buf, 5)
 
-    hour_idx = 0
-    for m, ndays in enumerate(days_in_month):
-        # Collect all hourly data for this month
-        month_hours = ndays * 24
-        month_data = profile_8760[hour_idx : hour_idx + month_hours]
-        hour_idx += month_hours
 
-        # Average into a single representative 24-hour day
-        for h in range(24):
-            values = [month_data[d * 24 + h] for d in range(ndays)]
-            avg = sum(values) / len(values)
-            profile_288.append(round(avg, 5))
+@njit(cache=True)
+def _month_average_kernel(hourly, month_start, out):
+    """Average each month's days of ``hourly`` into one 24-hour day in ``out``.
 
-    return profile_288
+    Each month is a contiguous block of ndays x 24 hours starting at
+    ``month_start[m]``; days are summed in order, as in ``sum(values) / n``.
+    """
+    for m in range(12):
+        start = month_start[m]
+        ndays = (month_start[m + 1] - start) // 24
+        for hour in range(24):
+            total = 0.0
+            for d in range(ndays):
+                total += hourly[start + d * 24 + hour]
+            out[m * 24 + hour] = total / ndays
 
 
 # ---------------------------------------------------------------------------
@@ -132,8 +165,8 @@ def compress_to_representative_days(profile_8760: list[float]) -> list[float]:
 
 def _generate_conflict_hours(
     conflict_pct: float,
-    solar_profile_288: list[float],
-) -> set[int]:
+    solar_profile_288: np.ndarray,
+) -> np.ndarray:
     """Select representative hours where gas operation is restricted.
 
     Conflict hours are biased toward nighttime (non-solar) hours since those
@@ -143,43 +176,30 @@ def _generate_conflict_hours(
     ----------
     conflict_pct : float
         Fraction of hours (0-1) that should have gas restrictions.
-    solar_profile_288 : list[float]
+    solar_profile_288 : np.ndarray
         288-element solar profile for weighting.
 
     Returns
     -------
-    set[int]
-        Set of hour indices (0-287) where gas is restricted.
+    np.ndarray
+        Boolean mask over the 288 representative hours, True where gas is
+        restricted.
     """
+    conflict_mask = np.zeros(288, dtype=bool)
     n_conflict = int(round(conflict_pct * 288))
     if n_conflict == 0:
-        return set()
+        return conflict_mask
 
-    # Weight nighttime hours more heavily
-    weights = []
-    for t in range(288):
-        cf = solar_profile_288[t]
-        # Inverse weighting: lower solar -> higher chance of conflict
-        w = 1.0 - cf + 0.1
-        weights.append(w)
+    # Weight nighttime hours more heavily: lower solar -> higher chance of conflict
+    probs = np.subtract(1.1, solar_profile_288, out=_profile_scratch())
+    probs /= probs.sum()
 
-    total_w = sum(weights)
-    probs = [w / total_w for w in weights]
+    # Deterministic seed for reproducibility; one weighted draw without
+    # replacement yields n distinct hours
+    rng = np.random.default_rng(42)
+    conflict_mask[rng.choice(288, size=n_conflict, replace=False, p=probs)] = True
 
-    # Deterministic seed for reproducibility
-    rng = random.Random(42)
-    conflict_set: set[int] = set()
-
-    while len(conflict_set) < n_conflict:
-        r = rng.random()
-        cumulative = 0.0
-        for t, p in enumerate(probs):
-            cumulative += p
-            if r <= cumulative:
-                conflict_set.add(t)
-                break
-
-    return conflict_set
+    return conflict_mask
 
 
 # ---------------------------------------------------------------------------
@@ -244,14 +264,14 @@ def _compute_emissions_factor(
     if total_load_mwh <= 0:
         return 0.0
 
-    # Gas-only emissions intensity (kg CO2/MWh of gas generation)
-    gas_emission_intensity = heat_rate * CO2_KG_PER_MMBTU / 1_000.0
+    # Gas emissions intensity x gas generation, blended over total load
+    return _gas_emission_intensity(heat_rate) * gas_gen_mwh / total_load_mwh
 
-    # Total emissions from gas
-    total_emissions_kg = gas_emission_intensity * gas_gen_mwh
 
-    # Blended over total load
-    return total_emissions_kg / total_load_mwh
+@lru_cache(maxsize=64)
+def _gas_emission_intensity(heat_rate: float) -> float:
+    """Gas emissions intensity in kg CO2 per MWh of gas generation."""
+    return heat_rate * CO2_KG_PER_MMBTU / 1_000.0
 
 
 # ---------------------------------------------------------------------------
@@ -271,6 +291,9 @@ def run_optimization(
     gas_capacity_factor: float | None = None,
     solar_cf_hint: float | None = None,
     max_solar_mw: float | None = None,
+    solver: str = "highs",
+    dispatch_format: str = "aos",
+    warm_start_from: dict | None = None,
 ) -> dict:
     """Run the full optimization pipeline.
 
@@ -297,11 +320,21 @@ def run_optimization(
     solar_profile : list[float] | None
         Solar capacity factors -- either 8760 or 288 entries, or None
         to use a synthetic profile.
+    solver : str
+        MILP solver backend: ``"highs"`` (default) or ``"cbc"``.
+    dispatch_format : str
+        ``"aos"`` (row dicts, default) or ``"soa"`` (one list per field) for
+        ``hourly_dispatch``; see :func:`~optimizer.model.build_and_solve`.
+    warm_start_from : dict | None
+        A previous result of this function; its private solver ``_basis``
+        warm-starts HiGHS (sweeps thread each result into the next call).
 
     Returns
     -------
     dict
-        Complete optimization result matching OptimizeResponse schema.
+        Complete optimization result matching OptimizeResponse schema, plus
+        the private ``_basis`` for *warm_start_from*, which callers building
+        a response must drop.
     """
     logger.info(
         "Starting optimization for plant=%s  load=%.1f MW  year=%d",
@@ -314,13 +347,15 @@ def run_optimization(
     # 1. Solar profile
     # -------------------------------------------------------------------
     site_latitude = latitude if latitude is not None else DEFAULT_LATITUDE
+    annual_load_mwh = target_load_mw * 8760
+    has_load = annual_load_mwh > 0
 
     if solar_profile is not None:
         if len(solar_profile) == 8760:
             logger.info("Compressing 8760-hour profile to 288 representative hours")
             solar_profile_288 = compress_to_representative_days(solar_profile)
         elif len(solar_profile) == 288:
-            solar_profile_288 = solar_profile
+            solar_profile_288 = np.asarray(solar_profile, dtype=np.float64)
         else:
             raise ValueError(
                 f"solar_profile must have 288 or 8760 entries, got {len(solar_profile)}"
@@ -335,16 +370,18 @@ def run_optimization(
     if solar_cf_hint is not None and solar_cf_hint > 0:
         normalized_cf = solar_cf_hint / 100.0 if solar_cf_hint > 1 else solar_cf_hint
         normalized_cf = max(0.05, min(0.45, normalized_cf))
-        profile_avg = sum(solar_profile_288) / max(len(solar_profile_288), 1)
+        profile_avg = solar_profile_288.mean()
         if profile_avg > 0:
             scale_cf = normalized_cf / profile_avg
-            solar_profile_288 = [max(0.0, min(1.0, round(v * scale_cf, 5))) for v in solar_profile_288]
+            solar_profile_288 = np.clip(np.round(solar_profile_288 * scale_cf, 5), 0.0, 1.0)
 
     # -------------------------------------------------------------------
     # 2. Gas parameters
     # -------------------------------------------------------------------
     gas_heat_rate = gas_heat_rate_btu_kwh if gas_heat_rate_btu_kwh is not None else DEFAULT_GAS_HEAT_RATE
     gas_price = cost_params["gas_price_per_mmbtu"]
+    wacc = cost_params["wacc"]
+    solar_life_years = cost_params["solar_life_years"]
     gas_var_cost = _gas_variable_cost(gas_heat_rate, gas_price)
     # Gas capacity: assume existing plant can cover full load
     gas_capacity_mw = target_load_mw
@@ -359,11 +396,11 @@ def run_optimization(
     # -------------------------------------------------------------------
     # 3. Conflict hours
     # -------------------------------------------------------------------
-    conflict_hours: set[int] | None = None
+    conflict_hours: np.ndarray | None = None
     n_conflict = 0
     if conflict_pct is not None and conflict_pct > 0:
         conflict_hours = _generate_conflict_hours(conflict_pct, solar_profile_288)
-        n_conflict = len(conflict_hours)
+        n_conflict = int(np.count_nonzero(conflict_hours))
         logger.info("Generated %d conflict hours (%.1f%%)", n_conflict, conflict_pct * 100)
 
     # -------------------------------------------------------------------
@@ -379,12 +416,14 @@ def run_optimization(
         cost_params=cost_params,
         max_solar_mw=max_solar_mw,
         conflict_hours=conflict_hours,
+        solver=solver,
+        dispatch_format=dispatch_format,
+        warm_start_from=warm_start_from,
     )
 
     # -------------------------------------------------------------------
     # 5. Compute LCOE breakdown
     # -------------------------------------------------------------------
-    annual_load_mwh = target_load_mw * 8760
     annual_gas_gen = result["gas_gen_total"]
     annual_solar_gen = result.get("solar_gen_total", 0.0)
 
@@ -399,7 +438,7 @@ def run_optimization(
     )
 
     # Net LCOE (total annual cost / total annual load)
-    net_lcoe = costs["total"] / annual_load_mwh if annual_load_mwh > 0 else 0.0
+    net_lcoe = costs["total"] / annual_load_mwh if has_load else 0.0
 
     # Gas-only LCOE for comparison
     gas_cf = gas_capacity_factor if gas_capacity_factor is not None else DEFAULT_GAS_CAPACITY_FACTOR
@@ -413,12 +452,12 @@ def run_optimization(
         fixed_om_per_kw_year=DEFAULT_GAS_FIXED_OM,
         capacity_factor=gas_cf,
         capex_per_kw=0.0,
-        wacc=cost_params["wacc"],
-        life_years=cost_params["solar_life_years"],
+        wacc=wacc,
+        life_years=solar_life_years,
     )
 
     # Gas backup actual percentage
-    gas_backup_actual = annual_gas_gen / annual_load_mwh if annual_load_mwh > 0 else 0.0
+    gas_backup_actual = annual_gas_gen / annual_load_mwh if has_load else 0.0
 
     # Excess solar: generation beyond load served (approximate)
     excess_solar_mwh = max(0.0, annual_solar_gen - annual_load_mwh)
@@ -440,16 +479,18 @@ def run_optimization(
     # -------------------------------------------------------------------
     # 7. LCOE breakdown in $/MWh
     # -------------------------------------------------------------------
+    if has_load:
+        solar_cost, battery_cost, gas_cost = (
+            round(costs[key] / annual_load_mwh, 2)
+            for key in ("solar_cost", "battery_cost", "gas_cost")
+        )
+    else:
+        solar_cost = battery_cost = gas_cost = 0.0
+
     lcoe_breakdown = {
-        "solar_cost": round(costs["solar_cost"] / annual_load_mwh, 2)
-        if annual_load_mwh > 0
-        else 0.0,
-        "battery_cost": round(costs["battery_cost"] / annual_load_mwh, 2)
-        if annual_load_mwh > 0
-        else 0.0,
-        "gas_cost": round(costs["gas_cost"] / annual_load_mwh, 2)
-        if annual_load_mwh > 0
-        else 0.0,
+        "solar_cost": solar_cost,
+        "battery_cost": battery_cost,
+        "gas_cost": gas_cost,
         "excess_solar_revenue": 0.0,
         "total": round(net_lcoe, 2),
     }
@@ -471,19 +512,21 @@ def run_optimization(
         "solver_status": result["solver_status"],
         "lcoe_breakdown": lcoe_breakdown,
         "hourly_dispatch": result["hourly_dispatch"],
+        "_basis": result["_basis"],
     }
 
-    logger.info(
-        "Optimization result: LCOE=%.2f $/MWh (gas-only=%.2f)  "
-        "solar=%.1f MW  batt=%.1f MW/%.1f MWh  gas_backup=%.1f%%  "
-        "emissions=%.1f kg/MWh",
-        net_lcoe,
-        lcoe_gas_only,
-        result["solar_capacity_mw"],
-        result["battery_power_mw"],
-        result["battery_energy_mwh"],
-        gas_backup_actual * 100,
-        emissions_factor,
-    )
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(
+            "Optimization result: LCOE=%.2f $/MWh (gas-only=%.2f)  "
+            "solar=%.1f MW  batt=%.1f MW/%.1f MWh  gas_backup=%.1f%%  "
+            "emissions=%.1f kg/MWh",
+            net_lcoe,
+            lcoe_gas_only,
+            result["solar_capacity_mw"],
+            result["battery_power_mw"],
+            result["battery_energy_mwh"],
+            gas_backup_actual * 100,
+            emissions_factor,
+        )
 
     return response
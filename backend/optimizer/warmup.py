@@ -0,0 +1,57 @@
+"""
+Warm-up routine that primes the solver and simulation code paths.
+
+Called once per process at startup so the first real request does not pay
+for module imports, solver start-up, or JIT compilation.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+
+from optimizer.byog_engine import CalculationClass
+from optimizer.solver import run_optimization
+
+logger = logging.getLogger(__name__)
+
+WARMUP_TARGET_LOAD_MW = 1.0
+
+
+def warm_up(cost_params: dict) -> None:
+    """Run a tiny MILP solve and a default BYOG simulation.
+
+    Parameters
+    ----------
+    cost_params : dict
+        Any valid cost scenario (see ``COST_SCENARIOS`` in ``main``).
+    """
+    start = time.perf_counter()
+
+    run_optimization(
+        plant_id="warmup",
+        target_load_mw=WARMUP_TARGET_LOAD_MW,
+        max_gas_backup_pct=0.05,
+        commissioning_year=2028,
+        cost_params=cost_params,
+    )
+    CalculationClass({}).run()
+
+    logger.info("Warm-up finished in %.2fs", time.perf_counter() - start)
+
+
+def warm_up_simulation() -> None:
+    """Compile the BYOG simulation kernels in a solver-pool process.
+
+    Used as the ``ProcessPoolExecutor`` initializer, so it never raises: an
+    initializer failure would break the pool for good, whereas a cold kernel
+    only costs the first request its compile time.
+    """
+    start = time.perf_counter()
+    try:
+        CalculationClass({}).run()
+        CalculationClass.run_many([{}])
+    except Exception:
+        logger.exception("Simulation warm-up failed; first request will pay JIT cost")
+        return
+    logger.info("Simulation warm-up finished in %.2fs", time.perf_counter() - start)
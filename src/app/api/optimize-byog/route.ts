@@ -36,6 +36,8 @@ if mode == "single_variable_goal_seek":
     out = service.single_variable_goal_seek(job)
 elif mode == "multi_variable":
     out = service.multi_variable_optimize(job)
+elif mode == "multi_variable_zoom":
+    out = service.multi_variable_optimize_zoom(job)
 elif mode == "sensitivity_heatmap":
     out = service.dynamic_sensitivity_heatmap(job)
 else: